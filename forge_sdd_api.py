@@ -0,0 +1,265 @@
+"""
+Forge SDD API - In-process interface to the Forge SDD Toolkit
+
+Drives the same operations as the forge-sdd CLI without console output,
+returning plain dicts instead. Functions take the project path explicitly,
+never change the working directory and are safe to call from several threads.
+
+Usage:
+    import forge_sdd_api as forge_sdd
+
+    result = forge_sdd.init_project("/path/to/app", agents=["github-copilot", "cursor"])
+    tools = forge_sdd.check_tools()
+    feature = forge_sdd.create_feature("/path/to/app", "painel de histórico de mudanças")
+"""
+
+import re
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence, Union
+
+from forge_sdd_cli import (
+    LINK_MODES,
+    REQUIRED_TOOLS,
+    check_tool,
+    copy_toolkit_structure,
+    create_forge_specs_dir,
+    create_readme_guide,
+    detect_tool_version,
+    find_legacy_paths,
+    find_toolkit_root,
+    init_git_repo,
+    is_forge_project,
+    is_git_repo,
+    list_spec_dirs,
+    make_scripts_executable,
+    parse_agents_option,
+)
+
+__all__ = [
+    "ForgeSDDError",
+    "init_project",
+    "check_tools",
+    "create_feature",
+    "list_specs",
+]
+
+# One lock per repository, held while numbering a spec and checking out its
+# branch, so threads of this process never race on HEAD or .git/index.lock
+_project_locks: Dict[Path, threading.Lock] = {}
+_project_locks_lock = threading.Lock()
+
+MANIFEST_NOTES_TEMPLATE = """# Atualizações necessárias no manifest.yml
+
+## Módulos a adicionar
+```yaml
+modules:
+  # Adicionar módulos aqui
+```
+
+## Permissões/Escopos a adicionar
+```yaml
+permissions:
+  scopes:
+    # Adicionar escopos aqui
+```
+
+## Notas
+- [ ] Validar se todos os módulos estão declarados
+- [ ] Verificar se as permissões são mínimas necessárias
+- [ ] Testar com `forge lint`
+"""
+
+
+class ForgeSDDError(Exception):
+    """Raised when a toolkit operation cannot be completed"""
+
+
+def _project_lock(project_path: Path) -> threading.Lock:
+    """Lock shared by every project inside the same git work tree"""
+    key = next((p for p in (project_path, *project_path.parents) if (p / ".git").exists()), project_path)
+    with _project_locks_lock:
+        return _project_locks.setdefault(key, threading.Lock())
+
+
+def _toolkit_root() -> Path:
+    toolkit_root = find_toolkit_root()
+    if toolkit_root is None:
+        raise ForgeSDDError("Could not find toolkit resources (ai-agents/, prompts/, templates/)")
+    return toolkit_root
+
+
+def init_project(
+    path: Union[str, Path],
+    agents: Union[str, Sequence[str]] = "github-copilot",
+    link_mode: str = "copy",
+    git: bool = True,
+    force: bool = False,
+) -> dict:
+    """Install the toolkit into a Forge project
+
+    Args:
+        path: Project directory
+        agents: Agent id, comma-separated ids or a list of ids
+        link_mode: 'copy' or 'symlink' for forge-sdd/scripts and templates
+        git: Initialize a git repository if the project is not in one
+        force: Install even if the directory has no manifest.yml
+
+    Returns:
+        dict with project_path, agents, files, dirs, git ('existing',
+        'initialized', 'failed', 'unavailable' or 'skipped') and legacy
+        (list of (legacy directory, new location) pairs)
+
+    Raises:
+        ForgeSDDError: If the directory is not a Forge project (without force),
+            an agent or link mode is unknown, or toolkit resources are missing
+    """
+    project_path = Path(path).resolve()
+    if not project_path.is_dir():
+        raise ForgeSDDError(f"Project directory not found: {project_path}")
+    if not force and not is_forge_project(project_path):
+        raise ForgeSDDError(f"Not a Forge project (no manifest.yml): {project_path}")
+    if link_mode not in LINK_MODES:
+        raise ForgeSDDError(f"Invalid link mode '{link_mode}'. Use one of: {', '.join(LINK_MODES)}")
+
+    toolkit_root = _toolkit_root()
+    agents_value = agents if isinstance(agents, str) else ",".join(agents)
+    try:
+        ai_agents = parse_agents_option(agents_value, toolkit_root)
+    except ValueError as e:
+        raise ForgeSDDError(str(e)) from e
+
+    stats = copy_toolkit_structure(project_path, ai_agents, link_mode=link_mode, toolkit_root=toolkit_root)
+    create_forge_specs_dir(project_path)
+    create_readme_guide(project_path, ai_agents, toolkit_root)
+    make_scripts_executable(project_path)
+
+    if not git:
+        git_status = "skipped"
+    elif is_git_repo(project_path):
+        git_status = "existing"
+    elif not check_tool("git"):
+        git_status = "unavailable"
+    else:
+        git_status = "initialized" if init_git_repo(project_path) else "failed"
+
+    return {
+        "project_path": str(project_path),
+        "agents": ai_agents,
+        "files": stats["files"],
+        "dirs": stats["dirs"],
+        "git": git_status,
+        "legacy": find_legacy_paths(project_path),
+    }
+
+
+def check_tools() -> dict:
+    """Check the tools used by the Forge SDD workflow
+
+    Returns:
+        dict mapping tool name to {"installed": bool, "version": str or None}
+    """
+    results = {}
+    for tool in REQUIRED_TOOLS:
+        version = detect_tool_version(tool)
+        results[tool] = {"installed": version is not None, "version": version}
+    return results
+
+
+def _feature_slug(description: str) -> str:
+    """First three words of the description, lowercased and dash-separated (as create-new-feature.sh)"""
+    words = [w for w in re.sub(r"[^a-z0-9]", "-", description.lower()).split("-") if w]
+    return "-".join(words[:3])
+
+
+def create_feature(path: Union[str, Path], description: str, create_branch: bool = True) -> dict:
+    """Create the next numbered spec directory for a feature
+
+    Mirrors forge-sdd/scripts/bash/create-new-feature.sh: allocates
+    forge-sdd/specs/NNN-<slug>/, copies the ideate template to
+    feature-spec.md, writes manifest-updates.md and optionally creates a git
+    branch with the same name.
+
+    Calls for the same project are serialized up to and including the branch
+    checkout. Each call checks out its own branch, so after concurrent calls
+    HEAD is on the branch of whichever call ran last.
+
+    Returns:
+        dict with branch_name, feature_num, spec_dir, spec_file, manifest_notes
+        and branch_created
+
+    Raises:
+        ForgeSDDError: If the description is empty or the branch cannot be created
+    """
+    if not description.strip():
+        raise ForgeSDDError("No feature description provided")
+
+    project_path = Path(path).resolve()
+    specs_dir = project_path / "forge-sdd" / "specs"
+    slug = _feature_slug(description)
+
+    with _project_lock(project_path):
+        specs_dir.mkdir(parents=True, exist_ok=True)
+        highest = 0
+        for spec_dir in list_spec_dirs(project_path):
+            match = re.match(r"\d+", spec_dir.name)
+            if match:
+                highest = max(highest, int(match.group()))
+        # Skip numbers taken since the listing (e.g. by the bash script)
+        for number in range(highest + 1, highest + 100):
+            feature_num = f"{number:03d}"
+            branch_name = f"{feature_num}-{slug}"
+            feature_dir = specs_dir / branch_name
+            try:
+                feature_dir.mkdir()
+                break
+            except FileExistsError:
+                continue
+        else:
+            raise ForgeSDDError(f"Could not allocate a spec directory in {specs_dir}")
+
+        branch_created = False
+        if create_branch and is_git_repo(project_path):
+            try:
+                subprocess.run(
+                    ["git", "checkout", "-b", branch_name],
+                    check=True, capture_output=True, text=True, cwd=project_path,
+                )
+                branch_created = True
+            except subprocess.CalledProcessError as e:
+                feature_dir.rmdir()
+                raise ForgeSDDError(f"Could not create branch {branch_name}: {e.stderr.strip()}") from e
+
+    spec_file = feature_dir / "feature-spec.md"
+    template = project_path / "forge-sdd" / "templates" / "ideate-template.md"
+    spec_file.write_text(template.read_text(encoding="utf-8") if template.exists() else "", encoding="utf-8")
+
+    manifest_notes = feature_dir / "manifest-updates.md"
+    manifest_notes.write_text(MANIFEST_NOTES_TEMPLATE, encoding="utf-8")
+
+    return {
+        "branch_name": branch_name,
+        "feature_num": feature_num,
+        "spec_dir": str(feature_dir),
+        "spec_file": str(spec_file),
+        "manifest_notes": str(manifest_notes),
+        "branch_created": branch_created,
+    }
+
+
+def list_specs(path: Union[str, Path]) -> List[dict]:
+    """List feature specs with the documents each one has
+
+    Returns:
+        List of {"name", "path", "files"} dicts sorted by spec name
+    """
+    project_path = Path(path).resolve()
+    return [
+        {
+            "name": spec_dir.name,
+            "path": str(spec_dir),
+            "files": sorted(f.name for f in spec_dir.iterdir() if f.is_file()),
+        }
+        for spec_dir in list_spec_dirs(project_path)
+    ]
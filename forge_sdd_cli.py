@@ -21,19 +21,29 @@ Or install globally:
     forge-sdd check
 """
 
+import hashlib
+import json
 import os
+import re
+import shlex
 import subprocess
 import sys
 import shutil
+import sqlite3
+import threading
+import zipfile
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 import typer
 import yaml
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.text import Text
 from rich.align import Align
+from rich.table import Table
 from rich.tree import Tree
 from typer.core import TyperGroup
 
@@ -174,45 +184,36 @@ def select_ai_agent() -> str:
     Returns:
         str: The selected agent identifier ('github-copilot', 'cursor', 'windsurf', etc.)
     """
-    agents = {
-        "1": {
-            "id": "github-copilot",
-            "name": "GitHub Copilot",
-            "status": "✅ Supported",
-            "config_file": "copilot-instructions.md",
-            "target_path": ".github/copilot-instructions.md"
-        },
-        # Future agents will be added here
-        # "2": {
-        #     "id": "cursor",
-        #     "name": "Cursor AI",
-        #     "status": "🚧 Coming Soon",
-        #     "config_file": "cursor-rules.md",
-        #     "target_path": ".cursorrules"
-        # },
-        # "3": {
-        #     "id": "windsurf",
-        #     "name": "Windsurf AI",
-        #     "status": "🚧 Coming Soon",
-        #     "config_file": "windsurf-config.md",
-        #     "target_path": ".windsurf/config.md"
-        # },
-    }
+    registry = load_agent_registry()
+    if not registry:
+        console.print(
+            f"[red]Error:[/red] no agent descriptors found in [cyan]{get_toolkit_root() / 'ai-agents'}[/cyan] "
+            "(expected ai-agents/<agent-id>/agent.yml)"
+        )
+        raise typer.Exit(1)
+    agents = {str(i): agent for i, agent in enumerate(registry.values(), start=1)}
     
     console.print("\n[cyan bold]Select your AI coding assistant:[/cyan bold]\n")
     
     for key, agent in agents.items():
-        console.print(f"  [{key}] {agent['name']:<20} {agent['status']}")
+        status = "✅ Supported" if agent["status"] == "supported" else "🚧 Coming Soon"
+        console.print(f"  [{key}] {agent['name']:<20} {status}")
     
     console.print()
+    console.print("[dim]Tip: use --agents a,b,c to install several agents at once[/dim]")
     
-    # For now, only option 1 is available
-    # In future, we'll add actual input prompt: choice = typer.prompt("Enter choice", default="1")
-    choice = "1"
+    # Non-interactive for now: first supported agent is the default.
+    # In future, we'll add actual input prompt: choice = typer.prompt("Enter choice", default=default)
+    supported = [key for key, agent in agents.items() if agent["status"] == "supported"]
+    if not supported:
+        console.print("[red]Error:[/red] no supported agent descriptors found")
+        raise typer.Exit(1)
+    default = supported[0]
+    choice = default
     
-    if choice not in agents:
-        console.print("[red]Invalid choice, defaulting to GitHub Copilot[/red]")
-        choice = "1"
+    if choice not in supported:
+        choice = default
+        console.print(f"[red]Invalid choice, defaulting to {agents[choice]['name']}[/red]")
     
     selected = agents[choice]
     console.print(f"[green]✓[/green] Selected: [cyan]{selected['name']}[/cyan]\n")
@@ -254,16 +255,12 @@ def is_git_repo(path: Path = None) -> bool:
 def init_git_repo(project_path: Path, quiet: bool = False) -> bool:
     """Initialize a git repository"""
     try:
-        original_cwd = Path.cwd()
-        os.chdir(project_path)
-        subprocess.run(["git", "init"], check=True, capture_output=True)
-        subprocess.run(["git", "add", "."], check=True, capture_output=True)
-        subprocess.run(["git", "commit", "-m", "feat: Initialize Forge SDD Toolkit"], check=True, capture_output=True)
+        subprocess.run(["git", "init"], check=True, capture_output=True, cwd=project_path)
+        subprocess.run(["git", "add", "."], check=True, capture_output=True, cwd=project_path)
+        subprocess.run(["git", "commit", "-m", "feat: Initialize Forge SDD Toolkit"], check=True, capture_output=True, cwd=project_path)
         return True
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, FileNotFoundError):
         return False
-    finally:
-        os.chdir(original_cwd)
 
 
 def is_forge_project(path: Path) -> bool:
@@ -272,11 +269,14 @@ def is_forge_project(path: Path) -> bool:
     return manifest.exists()
 
 
-def get_toolkit_root() -> Path:
-    """Get the root directory of the toolkit (where resource files are located)
+def find_toolkit_root() -> Optional[Path]:
+    """Find the root directory of the toolkit (where resource files are located)
     
     When running from source: returns the directory containing this file
     When installed via pip/uv: searches for forge_sdd_toolkit_data directory
+    
+    Returns:
+        The toolkit root, or None if no resource directory was found
     """
     # Get directory of this module
     module_dir = Path(__file__).parent
@@ -297,87 +297,250 @@ def get_toolkit_root() -> Path:
         
     # Last resort: try to find the repo root by walking up
     current = module_dir
-    search_paths = [str(module_dir)]
     for _ in range(5):  # Don't go too far up
         if (current / "ai-agents").exists() and (current / "prompts").exists():
             return current
         if (current / "forge_sdd_toolkit_data").exists():
             return current / "forge_sdd_toolkit_data"
-        search_paths.append(str(current))
         current = current.parent
     
+    return None
+
+
+def get_toolkit_root() -> Path:
+    """Get the root directory of the toolkit, warning if resources are missing"""
+    toolkit_root = find_toolkit_root()
+    if toolkit_root is not None:
+        return toolkit_root
+
     # If nothing found, return module dir and let the error happen downstream
+    module_dir = Path(__file__).parent
     console.print(f"[yellow]Warning: Could not find toolkit resources. Searched in:[/yellow]")
-    for path in search_paths:
-        console.print(f"  - {path}")
+    current = module_dir
+    for _ in range(5):
+        console.print(f"  - {current}")
+        current = current.parent
     return module_dir
 
 
+# Agent registry, loaded lazily from ai-agents/*/agent.yml on first use
+_agent_registry: Optional[Dict[str, dict]] = None
+_agent_registry_lock = threading.Lock()
+
+
+def load_agent_registry(toolkit_root: Optional[Path] = None) -> Dict[str, dict]:
+    """Load AI agent descriptors from ai-agents/<agent-id>/agent.yml
+
+    Each descriptor declares where the agent expects its instructions file and
+    its slash-command prompts. The registry is read once per process and
+    returned ordered by the descriptor's ``order`` key. Descriptors that cannot
+    be parsed are skipped.
+    """
+    global _agent_registry
+    with _agent_registry_lock:
+        if _agent_registry is not None:
+            return _agent_registry
+
+        agents = []
+        agents_root = (toolkit_root or get_toolkit_root()) / "ai-agents"
+        for descriptor in sorted(agents_root.glob("*/agent.yml")):
+            try:
+                data = yaml.safe_load(descriptor.read_text(encoding="utf-8"))
+            except (OSError, yaml.YAMLError):
+                continue
+            if not isinstance(data, dict):
+                continue
+            data.setdefault("id", descriptor.parent.name)
+            data.setdefault("name", data["id"])
+            data.setdefault("status", "supported")
+            data.setdefault("order", 100)
+            data.setdefault("chat", data["name"])
+            agents.append(data)
+
+        agents.sort(key=lambda a: (a["order"], a["id"]))
+        _agent_registry = {agent["id"]: agent for agent in agents}
+        return _agent_registry
+
+
+def parse_agents_option(value: str, toolkit_root: Optional[Path] = None) -> List[str]:
+    """Parse a comma-separated --agents value, validating against the registry
+
+    Raises:
+        ValueError: If any agent id is not registered or is not supported yet
+            (status other than 'supported', e.g. 'planned')
+    """
+    registry = load_agent_registry(toolkit_root)
+    agent_ids = []
+    for agent_id in (part.strip() for part in value.split(",")):
+        if agent_id and agent_id not in agent_ids:
+            agent_ids.append(agent_id)
+
+    unknown = [agent_id for agent_id in agent_ids if agent_id not in registry]
+    if unknown:
+        raise ValueError(
+            f"Unknown agent(s): {', '.join(unknown)}. Available: {', '.join(registry)}"
+        )
+    unsupported = [agent_id for agent_id in agent_ids if registry[agent_id]["status"] != "supported"]
+    if unsupported:
+        raise ValueError(f"Agent(s) not supported yet: {', '.join(unsupported)}")
+    if not agent_ids:
+        raise ValueError("No agents given")
+    return agent_ids
+
+
+PROMPT_FRONT_MATTER_MODES = ("keep", "description", "strip")
+
+
+def render_prompt(text: str, front_matter: str = "keep") -> str:
+    """Adapt a prompts/*.prompt.md file to an agent's slash-command format
+
+    The prompts are written for GitHub Copilot, whose front matter also lists
+    context files and the script to run. Other agents ignore those keys, so
+    they are moved into the body as instructions.
 
-def copy_toolkit_structure(project_path: Path, ai_agent: str = "github-copilot", tracker: Optional[StepTracker] = None) -> dict:
-    """Copy toolkit structure to project
-    
     Args:
-        project_path: Target project path
-        ai_agent: Selected AI agent identifier (e.g., 'github-copilot', 'cursor', 'windsurf')
-        tracker: Optional progress tracker
+        text: Prompt file content
+        front_matter: 'keep' leaves the file unchanged, 'description' keeps
+            only the description key in the front matter and 'strip' drops the
+            front matter, moving the description into the body too
+
+    Raises:
+        ValueError: If front_matter is not one of PROMPT_FRONT_MATTER_MODES
+    """
+    if front_matter not in PROMPT_FRONT_MATTER_MODES:
+        raise ValueError(
+            f"Invalid prompt front_matter '{front_matter}'. Use one of: {', '.join(PROMPT_FRONT_MATTER_MODES)}"
+        )
+    match = re.match(r"---\n(.*?)\n---\n", text, re.DOTALL)
+    if front_matter == "keep" or not match:
+        return text
+    meta = yaml.safe_load(match.group(1)) or {}
+    body = text[match.end():]
+
+    preamble = []
+    if front_matter == "strip" and meta.get("description"):
+        preamble.append(f"**Objetivo:** {meta['description']}")
+    if meta.get("context"):
+        files = ", ".join(f"`{path}`" for path in meta["context"])
+        preamble.append(f"**Arquivos de contexto:** leia {files} antes de começar.")
+    scripts = meta.get("scripts") or {}
+    if scripts.get("sh"):
+        preamble.append(
+            f"**Script:** execute `{scripts['sh']}` a partir da raiz do projeto, "
+            "substituindo `{ARGS}` pela entrada do usuário."
+        )
+
+    header = ""
+    if front_matter == "description" and meta.get("description"):
+        description = yaml.safe_dump({"description": meta["description"]}, allow_unicode=True, width=1000)
+        header = f"---\n{description}---\n"
+    if preamble:
+        body = "\n\n".join(preamble) + "\n" + body
+    return header + body
+
+
+def install_agent_files(project_path: Path, ai_agents: List[str], toolkit_root: Path) -> dict:
+    """Install instructions and prompts for every selected agent in a single pass
+
+    Shared sources (instructions, prompts) are read and rendered once per
+    header or prompt front_matter mode (see render_prompt), then written to
+    each agent's target path.
+
+    Raises:
+        ValueError: If an agent has no descriptor in the registry
     """
-    toolkit_root = get_toolkit_root()
+    registry = load_agent_registry(toolkit_root)
+    missing = [agent_id for agent_id in ai_agents if agent_id not in registry]
+    if missing:
+        raise ValueError(
+            f"No agent descriptor found for: {', '.join(missing)} "
+            f"(expected {toolkit_root / 'ai-agents'}/<agent-id>/agent.yml)"
+        )
     stats = {"files": 0, "dirs": 0}
+    sources: Dict[Path, str] = {}
+    rendered: Dict[tuple, str] = {}
+    written = set()
+    created_dirs = set()
+
+    def read_source(path: Path) -> str:
+        if path not in sources:
+            sources[path] = path.read_text(encoding="utf-8")
+        return sources[path]
+
+    def write_target(target: Path, content: str):
+        if target in written:
+            return
+        if not target.parent.exists():
+            created_dirs.add(target.parent)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding="utf-8")
+        written.add(target)
 
-    # Copy AI agent configuration file to appropriate location
-    ai_agents_source = toolkit_root / "ai-agents" / ai_agent
-    
-    if ai_agents_source.exists():
-        # Map agent to their target paths
-        agent_targets = {
-            "github-copilot": {
-                "source_file": "copilot-instructions.md",
-                "target_dir": ".github",
-                "target_file": "copilot-instructions.md"
-            },
-            # Future agents will be mapped here
-            # "cursor": {
-            #     "source_file": "cursor-rules.md",
-            #     "target_dir": ".",
-            #     "target_file": ".cursorrules"
-            # },
-            # "windsurf": {
-            #     "source_file": "windsurf-config.md",
-            #     "target_dir": ".windsurf",
-            #     "target_file": "config.md"
-            # },
-        }
-        
-        if ai_agent in agent_targets:
-            target_config = agent_targets[ai_agent]
-            source_file = ai_agents_source / target_config["source_file"]
-            target_dir = project_path / target_config["target_dir"]
-            target_file = target_dir / target_config["target_file"]
-            
+    prompts_source = toolkit_root / "prompts"
+    prompt_files = sorted(prompts_source.glob("*.prompt.md")) if prompts_source.exists() else []
+
+    for agent_id in ai_agents:
+        agent = registry[agent_id]
+
+        instructions = agent.get("instructions")
+        if instructions:
+            source_file = toolkit_root / instructions["source"]
             if source_file.exists():
-                target_dir.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(source_file, target_file)
-                stats["files"] += 1
-                if not (project_path / target_config["target_dir"]).exists():
-                    stats["dirs"] += 1
+                header = instructions.get("header", "")
+                key = (source_file, header)
+                if key not in rendered:
+                    rendered[key] = header + read_source(source_file)
+                write_target(project_path / instructions["target"], rendered[key])
+
+        prompts = agent.get("prompts")
+        if prompts:
+            target_dir = project_path / prompts["target_dir"]
+            extension = prompts.get("extension", ".prompt.md")
+            front_matter = prompts.get("front_matter", "keep")
+            for prompt_file in prompt_files:
+                name = prompt_file.name[: -len(".prompt.md")] + extension
+                key = (prompt_file, front_matter)
+                if key not in rendered:
+                    rendered[key] = render_prompt(read_source(prompt_file), front_matter)
+                write_target(target_dir / name, rendered[key])
+
+    stats["files"] = len(written)
+    stats["dirs"] = len(created_dirs)
+    return stats
 
-    # Now copy prompts from prompts/ to .github/prompts/
-    prompts_source = toolkit_root / "prompts"
-    github_prompts_dest = project_path / ".github" / "prompts"
 
-    if prompts_source.exists():
-        # Create .github/prompts/ if it doesn't exist
-        github_prompts_dest.mkdir(parents=True, exist_ok=True)
+LINK_MODES = ("copy", "symlink")
+
+
+def copy_toolkit_structure(
+    project_path: Path,
+    ai_agents: Optional[List[str]] = None,
+    tracker: Optional[StepTracker] = None,
+    link_mode: str = "copy",
+    toolkit_root: Optional[Path] = None,
+) -> dict:
+    """Copy toolkit structure to project
+    
+    Args:
+        project_path: Target project path
+        ai_agents: Selected AI agent identifiers (e.g., ['github-copilot', 'cursor'])
+        tracker: Optional progress tracker
+        link_mode: 'copy' to copy forge-sdd/scripts and forge-sdd/templates, or
+            'symlink' to link them to the installed toolkit so they follow upgrades
+        toolkit_root: Toolkit resource directory (defaults to get_toolkit_root())
+    """
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"Invalid link mode '{link_mode}'. Use one of: {', '.join(LINK_MODES)}")
+    toolkit_root = toolkit_root or get_toolkit_root()
+    stats = {"files": 0, "dirs": 0}
 
-        # Copy each .prompt.md file
-        for prompt_file in prompts_source.glob("*.prompt.md"):
-            dest_file = github_prompts_dest / prompt_file.name
-            shutil.copy2(prompt_file, dest_file)
-            stats["files"] += 1
+    # Install AI agent instructions and prompts (e.g. .github/ for Copilot)
+    agent_stats = install_agent_files(project_path, ai_agents or ["github-copilot"], toolkit_root)
+    stats["files"] += agent_stats["files"]
+    stats["dirs"] += agent_stats["dirs"]
 
     # Copy other directories INTO forge-sdd/ to centralize toolkit
-    # Note: prompts/ are already copied to .github/prompts/ above (GitHub Copilot integration)
+    # Note: prompts/ are already installed per agent above
     # No need to duplicate them in project root
     
     # Create forge-sdd/ directory
@@ -395,9 +558,14 @@ def copy_toolkit_structure(project_path: Path, ai_agent: str = "github-copilot",
         dest = forge_sdd_dir / dest_name  # Now inside forge-sdd/
 
         if source.exists():
-            if dest.exists():
+            if dest.is_symlink():
+                dest.unlink()
+            elif dest.exists():
                 shutil.rmtree(dest)
-            shutil.copytree(source, dest, ignore=shutil.ignore_patterns('__pycache__', '*.pyc', '.DS_Store'))
+            if link_mode == "symlink":
+                dest.symlink_to(source.resolve(), target_is_directory=True)
+            else:
+                shutil.copytree(source, dest, ignore=shutil.ignore_patterns('__pycache__', '*.pyc', '.DS_Store'))
             stats["dirs"] += 1
             stats["files"] += sum(1 for _ in dest.rglob('*') if _.is_file())
 
@@ -411,17 +579,40 @@ def create_forge_specs_dir(project_path: Path) -> None:
     (specs_dir / ".gitkeep").touch()
 
 
-def create_readme_guide(project_path: Path) -> None:
-    """Create README-FORGE-SDD.md with usage guide"""
-    readme_content = """# Forge SDD Toolkit - Guia de Uso
+def create_readme_guide(
+    project_path: Path, ai_agents: Optional[List[str]] = None, toolkit_root: Optional[Path] = None
+) -> None:
+    """Create README-FORGE-SDD.md with usage guide for the installed agents"""
+    registry = load_agent_registry(toolkit_root)
+    agents = [registry[agent_id] for agent_id in ai_agents or ["github-copilot"] if agent_id in registry]
+    names = ", ".join(agent["name"] for agent in agents) or "seu assistente de IA"
+    chat_lines = "\n".join(
+        f"- **{agent['name']}:** {agent['chat']} (comandos em `{agent['prompts']['target_dir']}/`)"
+        for agent in agents if agent.get("prompts")
+    )
+    tree_lines = []
+    doc_lines = []
+    for agent in agents:
+        if agent.get("instructions"):
+            target = agent["instructions"]["target"]
+            tree_lines.append(f"├── {target:<36} # Regras automáticas ({agent['name']})")
+            doc_lines.append(f"- **Instruções do {agent['name']}:** `{target}`")
+        if agent.get("prompts"):
+            tree_lines.append(f"├── {agent['prompts']['target_dir'] + '/':<36} # Slash commands ({agent['name']})")
+    agent_tree = "\n".join(tree_lines)
+    agent_docs = "\n".join(doc_lines)
+
+    readme_content = f"""# Forge SDD Toolkit - Guia de Uso
 
 Este projeto agora está configurado com o **Forge SDD Toolkit** para desenvolvimento orientado por especificações.
 
 ## 🚀 Como Usar
 
-### Com GitHub Copilot (Recomendado)
+### Com {names}
+
+Use os **slash commands** no chat do assistente:
 
-Use os **slash commands** no GitHub Copilot Chat:
+{chat_lines}
 
 #### 1. Criar Especificação (IDEATE)
 ```
@@ -451,7 +642,7 @@ Use os **slash commands** no GitHub Copilot Chat:
 
 **Output:** Valida e testa a implementação
 
-### Sem GitHub Copilot
+### Sem assistente de IA
 
 Use os scripts bash diretamente:
 
@@ -467,13 +658,7 @@ Use os scripts bash diretamente:
 
 ```
 seu-projeto/
-├── .github/
-│   ├── copilot-instructions.md    # Regras automáticas do Copilot
-│   └── prompts/                   # Slash commands (GitHub Copilot)
-│       ├── forge-ideate.prompt.md
-│       ├── forge-plan.prompt.md
-│       ├── forge-implement.prompt.md
-│       └── forge-test.prompt.md
+{agent_tree}
 └── forge-sdd/                      # 🔧 TOOLKIT CENTRALIZADO
     ├── specs/                      # Especificações criadas
     │   └── ###-feature-name/
@@ -508,13 +693,13 @@ forge deploy --non-interactive -e development
 forge logs -e development
 
 # Testar function
-forge function invoke my-function --payload '{"key":"value"}'
+forge function invoke my-function --payload '{{"key":"value"}}'
 ```
 
 ## 📚 Documentação
 
 - **Estruturas manifest.yml e templates:** `forge-sdd/templates/manifest-structures.md`
-- **GitHub Copilot Instructions:** `.github/copilot-instructions.md`
+{agent_docs}
 - **Toolkit README:** Visite o repositório do toolkit
 
 ## 🎯 Workflow Recomendado
@@ -537,16 +722,871 @@ forge function invoke my-function --payload '{"key":"value"}'
 def make_scripts_executable(project_path: Path) -> None:
     """Make bash scripts executable"""
     scripts_dir = project_path / "forge-sdd" / "scripts" / "bash"
-    if scripts_dir.exists():
+    # Symlinked scripts belong to the toolkit installation; leave them alone
+    if scripts_dir.exists() and not (project_path / "forge-sdd" / "scripts").is_symlink():
         for script in scripts_dir.glob("*.sh"):
             os.chmod(script, 0o755)
 
 
+LEGACY_LOCATIONS = [
+    ("prompts", ".github/prompts"),
+    ("scripts", "forge-sdd/scripts"),
+    ("templates", "forge-sdd/templates"),
+    ("forge-specs", "forge-sdd/specs"),
+]
+
+
+def find_legacy_paths(project_path: Path) -> List[tuple]:
+    """Find toolkit files left in the project root by older versions
+
+    Returns:
+        List of (legacy directory, new location) pairs. Only reported when at
+        least one legacy directory coexists with its new location (or for
+        forge-specs/, which always predates forge-sdd/specs/).
+    """
+    has_legacy = any([
+        (project_path / "prompts").exists() and (project_path / ".github" / "prompts").exists(),
+        (project_path / "scripts").exists() and (project_path / "forge-sdd" / "scripts").exists(),
+        (project_path / "templates").exists() and (project_path / "forge-sdd" / "templates").exists(),
+        (project_path / "forge-specs").exists(),
+    ])
+    if not has_legacy:
+        return []
+    return [(old, new) for old, new in LEGACY_LOCATIONS if (project_path / old).exists()]
+
+
+REQUIRED_TOOLS = ["git", "node", "npm", "forge"]
+
+
+def detect_tool_version(tool: str) -> Optional[str]:
+    """Return the tool's version string, 'available' if it has no --version, or None if not installed"""
+    if not check_tool(tool):
+        return None
+    if tool == "git":
+        return "available"
+    try:
+        result = subprocess.run([tool, "--version"], capture_output=True, text=True)
+        return result.stdout.strip() or "available"
+    except (OSError, subprocess.SubprocessError):
+        return "available"
+
+
+def list_spec_dirs(project_path: Path) -> List[Path]:
+    """List feature spec directories (forge-sdd/specs/NNN-*) sorted by name"""
+    specs_dir = project_path / "forge-sdd" / "specs"
+    if not specs_dir.exists():
+        return []
+    return sorted(p for p in specs_dir.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+
+def load_manifest(project_path: Path) -> dict:
+    """Parse manifest.yml, returning an empty dict if missing or empty
+
+    Raises:
+        yaml.YAMLError: If the manifest is not valid YAML
+    """
+    manifest_path = project_path / "manifest.yml"
+    if not manifest_path.exists():
+        return {}
+    data = yaml.safe_load(manifest_path.read_text(encoding="utf-8"))
+    return data if isinstance(data, dict) else {}
+
+
+def index_manifest(manifest: dict) -> dict:
+    """Index manifest functions, resources and the modules that reference them
+
+    Returns:
+        dict with:
+          - functions: {key: handler}
+          - resources: {key: path}
+          - modules: [{"type", "key", "functions", "resources"}]
+    """
+    modules_section = manifest.get("modules") or {}
+    functions = {}
+    resources = {}
+    modules = []
+
+    for entry in modules_section.get("function") or []:
+        if isinstance(entry, dict) and entry.get("key"):
+            functions[entry["key"]] = str(entry.get("handler", ""))
+
+    for entry in manifest.get("resources") or []:
+        if isinstance(entry, dict) and entry.get("key"):
+            resources[entry["key"]] = str(entry.get("path", ""))
+
+    for module_type, entries in modules_section.items():
+        if module_type == "function" or not isinstance(entries, list):
+            continue
+        for entry in entries:
+            if not isinstance(entry, dict) or not entry.get("key"):
+                continue
+            refs_functions = set()
+            if isinstance(entry.get("function"), str):
+                refs_functions.add(entry["function"])
+            resolver = entry.get("resolver")
+            if isinstance(resolver, dict) and isinstance(resolver.get("function"), str):
+                refs_functions.add(resolver["function"])
+            refs_resources = {entry["resource"]} if isinstance(entry.get("resource"), str) else set()
+            modules.append({
+                "type": module_type,
+                "key": entry["key"],
+                "functions": sorted(refs_functions),
+                "resources": sorted(refs_resources),
+            })
+
+    return {"functions": functions, "resources": resources, "modules": modules}
+
+
+# Changes to these files can affect every function and resource
+GLOBAL_PROJECT_FILES = {"manifest.yml", "package.json", "package-lock.json", "yarn.lock", "tsconfig.json"}
+
+
+def _handler_dir(handler: str) -> str:
+    """Map a Forge handler ('resolvers/index.handler') to its source directory under src/"""
+    module_path = handler.rsplit(".", 1)[0] if "." in handler else handler
+    parent = os.path.dirname(module_path)
+    return f"src/{parent}/" if parent else "src/"
+
+
+def _resource_dir(path: str) -> str:
+    """Map a resource path ('static/app/build') to its project directory ('static/app/')"""
+    parts = [p for p in path.strip("/").split("/") if p and p != "."]
+    while parts and parts[-1] in ("build", "dist", "out"):
+        parts.pop()
+    return "/".join(parts) + "/" if parts else ""
+
+
+def get_changed_paths(project_path: Path, base: str) -> List[str]:
+    """List paths changed since the branch forked from base, relative to project_path
+
+    Diffs the working tree (committed and uncommitted changes) against the
+    merge base of base and HEAD, so commits that landed on base after the
+    fork are not reported. Equivalent to `git diff --merge-base base`, which
+    needs git 2.30+.
+
+    Raises:
+        subprocess.CalledProcessError: If git fails (e.g. unknown ref or no common history)
+    """
+    merge_base = subprocess.run(
+        ["git", "merge-base", base, "HEAD"],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=project_path,
+    ).stdout.strip()
+    result = subprocess.run(
+        ["git", "diff", "--name-only", "--relative", merge_base, "--"],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=project_path,
+    )
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def compute_affected(project_path: Path, changed: List[str], index: Optional[dict] = None) -> dict:
+    """Map changed paths to the specs, manifest modules, functions and resources they belong to
+
+    Args:
+        index: Pre-built index_manifest() result (parsed from manifest.yml if omitted)
+    """
+    if index is None:
+        index = index_manifest(load_manifest(project_path))
+    function_dirs = {key: _handler_dir(handler) for key, handler in index["functions"].items()}
+    resource_dirs = {key: _resource_dir(path) for key, path in index["resources"].items()}
+
+    specs = set()
+    functions = set()
+    resources = set()
+    unmapped = []
+    global_change = False
+
+    for path in changed:
+        if path.startswith("forge-sdd/specs/"):
+            # Only files inside a spec directory; forge-sdd/specs/README.md is not a spec
+            spec_name = path.split("/")[2]
+            if path.count("/") >= 3 and not spec_name.startswith("."):
+                specs.add(spec_name)
+            continue
+        if path in GLOBAL_PROJECT_FILES:
+            global_change = True
+            continue
+        matched = False
+        for key, prefix in function_dirs.items():
+            if path.startswith(prefix):
+                functions.add(key)
+                matched = True
+        for key, prefix in resource_dirs.items():
+            if prefix and path.startswith(prefix):
+                resources.add(key)
+                matched = True
+        if not matched:
+            unmapped.append(path)
+
+    if global_change:
+        functions.update(index["functions"])
+        resources.update(index["resources"])
+
+    modules = {
+        module["key"]
+        for module in index["modules"]
+        if global_change
+        or functions.intersection(module["functions"])
+        or resources.intersection(module["resources"])
+    }
+
+    # Specs that mention an affected module or function key are affected too
+    keys = modules | functions
+    if keys:
+        key_pattern = re.compile(
+            r"(?<![\w-])(" + "|".join(re.escape(key) for key in sorted(keys)) + r")(?![\w-])"
+        )
+        for spec_dir in list_spec_dirs(project_path):
+            if spec_dir.name in specs:
+                continue
+            for doc in spec_dir.glob("*.md"):
+                text = doc.read_text(encoding="utf-8", errors="ignore")
+                if key_pattern.search(text):
+                    specs.add(spec_dir.name)
+                    break
+
+    return {
+        "changed": changed,
+        "manifest_changed": "manifest.yml" in changed,
+        "specs": sorted(specs),
+        "modules": sorted(modules),
+        "functions": sorted(functions),
+        "resources": sorted(resources),
+        "unmapped": unmapped,
+    }
+
+
+# Test-results ledger: one row per distinct version of a spec's test-results.md
+RESULTS_LEDGER = Path("forge-sdd") / "results.db"
+
+# Summary counts such as "10 passed, 0 failed", "5 pass / 0 fail", "Falharam: 0" or "| Passed | 3 |"
+_COUNT_LABELS = {
+    "passed": r"pass|passed|passing|passaram|aprovados",
+    "failed": r"fail|failed|failing|failures|falharam|falhas",
+    "skipped": r"skip|skipped|pulados|ignorados",
+}
+_RESULT_COUNTS = {
+    outcome: (
+        re.compile(rf"(\d+)\s+(?:{labels})\b", re.IGNORECASE),
+        re.compile(rf"\b(?:{labels})\b[*_\s]*[:|][*_\s]*(\d+)", re.IGNORECASE),
+    )
+    for outcome, labels in _COUNT_LABELS.items()
+}
+# Lines whose counts cover the whole run, preferred over per-suite counts
+_RESULT_TOTAL = re.compile(r"\b(total|totais|resumo|summary)\b", re.IGNORECASE)
+# Per-test rows: list items, table rows or lines starting with a result mark
+_RESULT_ROW = re.compile(r"^(?:[-*+]\s|\d+[.)]\s|\||[✅❌⏭✓✗])")
+_RESULT_CHECKLIST = re.compile(r"^[-*+]\s+\[[ xX]\]")
+_RESULT_FAIL_MARK = re.compile(r"❌|✗")
+_RESULT_FAIL = re.compile(r"❌|✗|\b(fail|failed|falhou)\b", re.IGNORECASE)
+_RESULT_PASS = re.compile(r"✅|✓|\b(pass|passed|passou|aprovado)\b", re.IGNORECASE)
+_RESULT_SKIP = re.compile(r"⏭|\b(skip|skipped|pulado|ignorado)\b", re.IGNORECASE)
+_RESULT_DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+
+
+def parse_test_results(text: str) -> dict:
+    """Summarize a test-results.md file
+
+    Lines with counts ("10 passed, 0 failed", "5 pass / 0 fail",
+    "Falharam: 0") are summaries. A Total/Resumo line gives the run's counts;
+    without one, the largest count per outcome across summaries is used, so
+    per-suite lines and a table repeating them are not added together.
+
+    Other result rows (list items, table rows or lines starting with
+    ✅/❌/⏭) count once, as failed, passed or skipped (in that precedence)
+    based on their markers. Failed rows are counted even when there is a
+    summary, so a run with any ❌/FAIL row is recorded as failed. Headings,
+    checklists and prose are ignored, so "corrigir falhas" is not a failure.
+
+    Returns:
+        dict with passed, failed, skipped, status ('failed', 'passed' or
+        'unknown') and run_date (first ISO date found, or None)
+    """
+    outcomes = ("passed", "failed", "skipped")
+    summary = dict.fromkeys(outcomes, 0)
+    totals = dict.fromkeys(outcomes, 0)
+    rows = dict.fromkeys(outcomes, 0)
+    has_summary = has_total = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        line_counts = {}
+        for outcome, patterns in _RESULT_COUNTS.items():
+            numbers = [int(m.group(1)) for pattern in patterns for m in pattern.finditer(stripped)]
+            if numbers:
+                line_counts[outcome] = max(numbers)
+        if line_counts:
+            is_total = bool(_RESULT_TOTAL.search(stripped))
+            has_summary = True
+            has_total = has_total or is_total
+            for outcome, number in line_counts.items():
+                summary[outcome] = max(summary[outcome], number)
+                if is_total:
+                    totals[outcome] = max(totals[outcome], number)
+            # A zero failure count is not a failed row; only an explicit mark is
+            if _RESULT_FAIL_MARK.search(stripped) and _RESULT_ROW.match(stripped):
+                rows["failed"] += 1
+            continue
+
+        if not _RESULT_ROW.match(stripped) or _RESULT_CHECKLIST.match(stripped):
+            continue
+        if _RESULT_FAIL.search(stripped):
+            rows["failed"] += 1
+        elif _RESULT_PASS.search(stripped):
+            rows["passed"] += 1
+        elif _RESULT_SKIP.search(stripped):
+            rows["skipped"] += 1
+
+    if has_summary:
+        counts = dict(totals if has_total else summary)
+        counts["failed"] = max(counts["failed"], rows["failed"])
+    else:
+        counts = rows
+
+    if counts["failed"]:
+        status = "failed"
+    elif counts["passed"]:
+        status = "passed"
+    else:
+        status = "unknown"
+
+    date_match = _RESULT_DATE.search(text)
+    return {**counts, "status": status, "run_date": date_match.group(1) if date_match else None}
+
+
+def open_results_ledger(project_path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the test-results ledger under forge-sdd/
+
+    Raises:
+        FileNotFoundError: If project_path has no forge-sdd/ directory
+    """
+    ledger_path = project_path / RESULTS_LEDGER
+    if not ledger_path.parent.is_dir():
+        raise FileNotFoundError(f"{ledger_path.parent} not found")
+    conn = sqlite3.connect(str(ledger_path))
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS sources (
+            spec TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            sha256 TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            spec TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            recorded_at TEXT NOT NULL,
+            run_date TEXT,
+            status TEXT NOT NULL,
+            passed INTEGER NOT NULL,
+            failed INTEGER NOT NULL,
+            skipped INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS runs_spec_id ON runs (spec, id);
+    """)
+    return conn
+
+
+def update_results_ledger(conn: sqlite3.Connection, project_path: Path) -> int:
+    """Append a run for every test-results.md whose content changed
+
+    Files with unchanged mtime and size are skipped without reading; the rest
+    are hashed and only re-parsed when the hash differs from the last run.
+
+    Returns:
+        Number of runs appended
+    """
+    known = {row[0]: row[1:] for row in conn.execute("SELECT spec, mtime_ns, size, sha256 FROM sources")}
+    recorded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    appended = 0
+
+    with conn:
+        for spec_dir in list_spec_dirs(project_path):
+            results_file = spec_dir / "test-results.md"
+            try:
+                stat = results_file.stat()
+            except FileNotFoundError:
+                continue
+            spec = spec_dir.name
+            previous = known.get(spec)
+            if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+                continue
+
+            data = results_file.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            conn.execute(
+                "INSERT OR REPLACE INTO sources (spec, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+                (spec, stat.st_mtime_ns, stat.st_size, digest),
+            )
+            if previous and previous[2] == digest:
+                continue
+
+            summary = parse_test_results(data.decode("utf-8", errors="replace"))
+            conn.execute(
+                "INSERT INTO runs (spec, sha256, recorded_at, run_date, status, passed, failed, skipped)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (spec, digest, recorded_at, summary["run_date"], summary["status"],
+                 summary["passed"], summary["failed"], summary["skipped"]),
+            )
+            appended += 1
+
+    return appended
+
+
+_LAST_RUNS_SQL = """
+    SELECT r.spec, r.status, r.passed, r.failed, r.skipped, COALESCE(r.run_date, substr(r.recorded_at, 1, 10)),
+           (SELECT COUNT(*) FROM runs c WHERE c.spec = r.spec)
+    FROM runs r
+    WHERE r.id = (SELECT MAX(id) FROM runs m WHERE m.spec = r.spec)
+"""
+
+
+def query_last_runs(conn: sqlite3.Connection, failing_only: bool = False) -> List[dict]:
+    """Last recorded run per spec, optionally only those that failed"""
+    sql = _LAST_RUNS_SQL + (" AND r.status = 'failed'" if failing_only else "") + " ORDER BY r.spec"
+    columns = ("spec", "status", "passed", "failed", "skipped", "date", "runs")
+    return [dict(zip(columns, row)) for row in conn.execute(sql)]
+
+
+def query_spec_runs(conn: sqlite3.Connection, spec: str) -> List[dict]:
+    """All recorded runs of one spec, most recent first"""
+    rows = conn.execute("""
+        SELECT spec, status, passed, failed, skipped, COALESCE(run_date, substr(recorded_at, 1, 10))
+        FROM runs WHERE spec = ? ORDER BY id DESC
+    """, (spec,))
+    columns = ("spec", "status", "passed", "failed", "skipped", "date")
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def query_flaky_specs(conn: sqlite3.Connection, window: int = 10) -> List[dict]:
+    """Specs with both passing and failing runs among their last `window` runs"""
+    rows = conn.execute("""
+        SELECT spec,
+               SUM(status = 'passed'), SUM(status = 'failed'), COUNT(*)
+        FROM (
+            SELECT spec, status,
+                   ROW_NUMBER() OVER (PARTITION BY spec ORDER BY id DESC) AS rn
+            FROM runs
+        )
+        WHERE rn <= ?
+        GROUP BY spec
+        HAVING SUM(status = 'passed') > 0 AND SUM(status = 'failed') > 0
+        ORDER BY spec
+    """, (window,))
+    columns = ("spec", "passed_runs", "failed_runs", "runs")
+    return [dict(zip(columns, row)) for row in rows]
+
+
+# Archived specs are packed into one zip; the zip central directory is the member index
+SPECS_ARCHIVE = Path("forge-sdd") / "specs-archive.zip"
+ARCHIVE_STUB = "ARCHIVED.md"
+
+_CHECKBOX = re.compile(r"^\s*(?:[-*]|\d+\.)\s+\[([ xX])\]", re.MULTILINE)
+
+
+def is_archived_spec(spec_dir: Path) -> bool:
+    """Check if a spec directory is an archive stub"""
+    return (spec_dir / ARCHIVE_STUB).exists()
+
+
+def spec_checklist_status(spec_dir: Path) -> tuple:
+    """Count checked and unchecked checklist items across a spec's markdown files
+
+    Returns:
+        (checked, unchecked)
+    """
+    checked = unchecked = 0
+    for doc in spec_dir.rglob("*.md"):
+        for mark in _CHECKBOX.findall(doc.read_text(encoding="utf-8", errors="ignore")):
+            if mark == " ":
+                unchecked += 1
+            else:
+                checked += 1
+    return checked, unchecked
+
+
+def is_spec_done(spec_dir: Path) -> bool:
+    """A spec is done when it has checklist items and all of them are checked"""
+    if is_archived_spec(spec_dir):
+        return False
+    checked, unchecked = spec_checklist_status(spec_dir)
+    return checked > 0 and unchecked == 0
+
+
+def archive_specs(project_path: Path, spec_dirs: List[Path]) -> List[dict]:
+    """Pack spec directories into the specs archive and replace them with stubs
+
+    Each spec's files are stored as <spec-name>/<relative path> members. The
+    directory is kept, holding only ARCHIVED.md, so spec numbering is preserved.
+
+    Returns:
+        List of {"spec", "files", "bytes"} for the archived specs
+
+    Raises:
+        ValueError: If any of the specs is already in the archive (nothing is written)
+    """
+    archive_path = project_path / SPECS_ARCHIVE
+    existing = set()
+    if archive_path.exists():
+        with zipfile.ZipFile(archive_path) as zf:
+            existing = set(zf.namelist())
+
+    # Check every spec before writing anything, so a collision leaves the archive untouched
+    batch = []
+    for spec_dir in dict.fromkeys(spec_dirs):
+        files = sorted(p for p in spec_dir.rglob("*") if p.is_file())
+        members = [f"{spec_dir.name}/{p.relative_to(spec_dir).as_posix()}" for p in files]
+        if existing.intersection(members):
+            raise ValueError(f"{spec_dir.name} is already in {SPECS_ARCHIVE}")
+        batch.append((spec_dir, files, members))
+
+    archived = []
+    with zipfile.ZipFile(archive_path, "a", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        for spec_dir, files, members in batch:
+            size = 0
+            for path, member in zip(files, members):
+                zf.write(path, member)
+                size += path.stat().st_size
+            archived.append({"spec": spec_dir.name, "files": members, "bytes": size})
+
+    # Only remove originals once the archive has been written and closed
+    for entry in archived:
+        spec_dir = project_path / "forge-sdd" / "specs" / entry["spec"]
+        shutil.rmtree(spec_dir)
+        spec_dir.mkdir()
+        file_lines = "\n".join(f"- `{m.split('/', 1)[1]}`" for m in entry["files"])
+        (spec_dir / ARCHIVE_STUB).write_text(
+            f"# {entry['spec']} (arquivada)\n\n"
+            f"Esta especificação foi arquivada em `{SPECS_ARCHIVE.as_posix()}`.\n"
+            f"Use `forge-sdd specs show {entry['spec']}` para ler os arquivos.\n\n"
+            f"## Arquivos\n{file_lines}\n",
+            encoding="utf-8",
+        )
+    return archived
+
+
+def is_plain_name(name: str) -> bool:
+    """True if name is a single path component that cannot leave its parent directory"""
+    return bool(name) and "/" not in name and "\\" not in name and ".." not in name
+
+
+def read_spec_file(project_path: Path, spec: str, filename: str = "feature-spec.md") -> str:
+    """Read a spec document from the working tree or, if archived, from the specs archive
+
+    Raises:
+        ValueError: If spec or filename is not a plain file name (contains /, \\ or ..)
+        FileNotFoundError: If the spec or document does not exist
+    """
+    for name in (spec, filename):
+        if not is_plain_name(name):
+            raise ValueError(f"Invalid name: {name}")
+    spec_dir = project_path / "forge-sdd" / "specs" / spec
+    doc = spec_dir / filename
+    if doc.is_file() and not is_archived_spec(spec_dir):
+        return doc.read_text(encoding="utf-8")
+
+    archive_path = project_path / SPECS_ARCHIVE
+    if archive_path.exists():
+        with zipfile.ZipFile(archive_path) as zf:
+            try:
+                return zf.read(f"{spec}/{filename}").decode("utf-8")
+            except KeyError:
+                pass
+    raise FileNotFoundError(f"{spec}/{filename}")
+
+
+def search_specs(project_path: Path, pattern: str, ignore_case: bool = False) -> List[dict]:
+    """Search spec markdown files, including archived ones, for a regular expression
+
+    Archived members are decompressed one at a time in memory; nothing is
+    extracted to disk.
+
+    Returns:
+        List of {"spec", "file", "line", "text", "archived"} matches
+    """
+    regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    matches = []
+
+    def scan(spec: str, filename: str, text: str, archived: bool):
+        for lineno, line in enumerate(text.splitlines(), start=1):
+            if regex.search(line):
+                matches.append({"spec": spec, "file": filename, "line": lineno, "text": line.strip(), "archived": archived})
+
+    for spec_dir in list_spec_dirs(project_path):
+        if is_archived_spec(spec_dir):
+            continue
+        for doc in sorted(spec_dir.rglob("*.md")):
+            scan(spec_dir.name, doc.relative_to(spec_dir).as_posix(),
+                 doc.read_text(encoding="utf-8", errors="ignore"), False)
+
+    archive_path = project_path / SPECS_ARCHIVE
+    if archive_path.exists():
+        with zipfile.ZipFile(archive_path) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not info.filename.endswith(".md"):
+                    continue
+                spec, _, filename = info.filename.partition("/")
+                scan(spec, filename, zf.read(info).decode("utf-8", errors="ignore"), True)
+
+    return matches
+
+
+HOOK_MARKER = "# forge-sdd pre-commit hook"
+
+PRE_COMMIT_HOOK = """#!/bin/sh
+{marker} (installed by `forge-sdd hooks install`)
+# Validates staged manifest.yml and spec files. Bypass with `git commit --no-verify`.
+cd ./{prefix} || exit 0
+git diff --cached --name-only --diff-filter=ACMR --relative -- manifest.yml forge-sdd/specs | grep -q . || exit 0
+if ! command -v forge-sdd >/dev/null 2>&1; then
+    echo "forge-sdd not found in PATH; skipping Forge SDD checks" >&2
+    exit 0
+fi
+exec forge-sdd hooks run
+"""
+
+# Spec documents and the template they are created from
+SPEC_TEMPLATES = {
+    "feature-spec.md": "ideate-template.md",
+    "implementation-plan.md": "plan-template.md",
+}
+
+_PLACEHOLDER = re.compile(r"\[([^\[\]\n]{2,})\](?!\()")
+_CLARIFICATION = re.compile(r"\[NEEDS CLARIFICATION:[^\]]*\]")
+_REQUIRED_SECTION = re.compile(r"^##\s+(.+?)\s*\*\(obrigatório\)\*", re.MULTILINE)
+
+def get_staged_paths(project_path: Path) -> List[str]:
+    """List staged (added, copied, modified or renamed) paths relative to project_path"""
+    result = subprocess.run(
+        ["git", "diff", "--cached", "--name-only", "--diff-filter=ACMR", "--relative"],
+        check=True, capture_output=True, text=True, cwd=project_path,
+    )
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def read_staged_files(project_path: Path, paths: List[str]) -> Dict[str, Optional[str]]:
+    """Read the staged (index) content of several files with one git cat-file call
+
+    Returns:
+        {path: content}, with None for paths that are not in the index
+    """
+    if not paths:
+        return {}
+    request = "".join(f":./{path}\n" for path in paths).encode("utf-8")
+    output = subprocess.run(
+        ["git", "cat-file", "--batch"],
+        input=request, check=True, capture_output=True, cwd=project_path,
+    ).stdout
+
+    contents = {}
+    offset = 0
+    for path in paths:
+        header_end = output.index(b"\n", offset)
+        header = output[offset:header_end].decode("utf-8", errors="replace").split()
+        offset = header_end + 1
+        if header[-1] == "missing" or len(header) < 3:
+            contents[path] = None
+            continue
+        size = int(header[2])
+        contents[path] = output[offset:offset + size].decode("utf-8", errors="replace")
+        offset += size + 1
+    return contents
+
+
+def check_manifest_structure(manifest: dict) -> List[tuple]:
+    """Check the manifest.yml rules from templates/manifest-structures.md
+
+    Returns:
+        List of (severity, message) with severity 'error' or 'warning'
+    """
+    issues = []
+    modules_section = manifest.get("modules")
+    if not isinstance(modules_section, dict):
+        return [("error", "'modules' section is missing or is not a mapping")]
+
+    index = index_manifest(manifest)
+    seen_keys = set()
+
+    for module_type, entries in modules_section.items():
+        if not isinstance(entries, list):
+            issues.append(("error", f"modules.{module_type} must be a list"))
+            continue
+        for entry in entries:
+            if not isinstance(entry, dict) or not entry.get("key"):
+                issues.append(("error", f"modules.{module_type} has an entry without 'key'"))
+                continue
+            key = entry["key"]
+            if key in seen_keys:
+                issues.append(("error", f"Duplicate module key '{key}'"))
+            seen_keys.add(key)
+            if module_type == "function" and "." not in str(entry.get("handler", "")):
+                issues.append(("error", f"Function '{key}' needs a 'handler' like index.handler"))
+
+    for entry in manifest.get("resources") or []:
+        if not isinstance(entry, dict) or not entry.get("key") or not entry.get("path"):
+            issues.append(("error", "Every resource needs 'key' and 'path'"))
+
+    for module in index["modules"]:
+        label = f"{module['type']} '{module['key']}'"
+        for function_key in module["functions"]:
+            if function_key not in index["functions"]:
+                issues.append(("error", f"{label} references undefined function '{function_key}'"))
+        for resource_key in module["resources"]:
+            if resource_key not in index["resources"]:
+                issues.append(("error", f"{label} references undefined resource '{resource_key}'"))
+
+    # UI modules (those with a resource) always need resolver.function and render: native
+    for module_type, entries in modules_section.items():
+        if module_type == "function" or not isinstance(entries, list):
+            continue
+        for entry in entries:
+            if not isinstance(entry, dict) or "resource" not in entry:
+                continue
+            label = f"{module_type} '{entry.get('key')}'"
+            resolver = entry.get("resolver")
+            if not isinstance(resolver, dict) or not resolver.get("function"):
+                issues.append(("error", f"{label} has a resource but no resolver.function (always required)"))
+            if entry.get("render") != "native":
+                issues.append(("warning", f"{label} should declare 'render: native'"))
+
+    return issues
+
+
+def load_template_rules(project_path: Path) -> dict:
+    """Collect placeholders and required sections from the spec templates
+
+    Uses the project's forge-sdd/templates/ and falls back to the toolkit's.
+
+    Returns:
+        {"placeholders": set of '[...]' strings, "sections": {spec file: [section titles]}}
+    """
+    templates_dir = project_path / "forge-sdd" / "templates"
+    if not templates_dir.exists():
+        toolkit_root = find_toolkit_root()
+        templates_dir = toolkit_root / "templates" if toolkit_root else templates_dir
+
+    placeholders = set()
+    sections = {}
+    for spec_file, template_name in SPEC_TEMPLATES.items():
+        template = templates_dir / template_name
+        if not template.exists():
+            continue
+        text = template.read_text(encoding="utf-8")
+        for match in _PLACEHOLDER.finditer(text):
+            inner = match.group(1)
+            if inner.strip().lower() in ("", "x") or inner.startswith("NEEDS CLARIFICATION"):
+                continue
+            placeholders.add(match.group(0))
+        sections[spec_file] = [title.strip() for title in _REQUIRED_SECTION.findall(text)]
+    return {"placeholders": placeholders, "sections": sections}
+
+
+def check_spec_document(filename: str, text: str, rules: dict) -> List[tuple]:
+    """Check one spec document for template placeholders and missing required sections
+
+    Returns:
+        List of (line or None, severity, message)
+    """
+    issues = []
+    placeholders = rules["placeholders"]
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        for match in _PLACEHOLDER.finditer(line):
+            if match.group(0) in placeholders:
+                issues.append((lineno, "error", f"Unfilled template placeholder {match.group(0)}"))
+        if _CLARIFICATION.search(line):
+            issues.append((lineno, "warning", "Open [NEEDS CLARIFICATION] question"))
+
+    for title in rules["sections"].get(filename, []):
+        match = re.search(rf"^##\s+{re.escape(title)}.*$", text, re.MULTILINE)
+        if not match:
+            issues.append((None, "error", f"Missing required section '## {title}'"))
+            continue
+        next_heading = re.search(r"^##\s", text[match.end():], re.MULTILINE)
+        body = text[match.end():match.end() + next_heading.start()] if next_heading else text[match.end():]
+        if not body.strip():
+            issues.append((None, "error", f"Required section '## {title}' is empty"))
+    return issues
+
+
+def validate_staged(project_path: Path) -> List[dict]:
+    """Run the pre-commit checks on staged manifest.yml and spec files only
+
+    Returns:
+        List of {"path", "line", "severity", "message"} issues
+    """
+    staged = [
+        path for path in get_staged_paths(project_path)
+        if path == "manifest.yml" or (path.startswith("forge-sdd/specs/") and path.endswith(".md"))
+    ]
+    if not staged:
+        return []
+
+    # Spec directories touched by this commit, and the files their checks need
+    spec_dirs = sorted({"/".join(path.split("/")[:3]) for path in staged if path.count("/") >= 3})
+    wanted = list(staged)
+    for spec_dir in spec_dirs:
+        for name in (ARCHIVE_STUB, "feature-spec.md"):
+            if f"{spec_dir}/{name}" not in wanted:
+                wanted.append(f"{spec_dir}/{name}")
+    contents = read_staged_files(project_path, wanted)
+
+    issues = []
+
+    def add(path, line, severity, message):
+        issues.append({"path": path, "line": line, "severity": severity, "message": message})
+
+    if "manifest.yml" in staged:
+        try:
+            manifest = yaml.safe_load(contents["manifest.yml"] or "")
+        except yaml.YAMLError as e:
+            add("manifest.yml", None, "error", f"Invalid YAML: {e}")
+        else:
+            if not isinstance(manifest, dict):
+                add("manifest.yml", None, "error", "manifest.yml must be a mapping")
+            else:
+                for severity, message in check_manifest_structure(manifest):
+                    add("manifest.yml", None, severity, message)
+
+    rules = load_template_rules(project_path) if spec_dirs else None
+    for spec_dir in spec_dirs:
+        if contents.get(f"{spec_dir}/{ARCHIVE_STUB}") is not None:
+            continue
+        if contents.get(f"{spec_dir}/feature-spec.md") is None:
+            add(spec_dir, None, "error", "Spec has no feature-spec.md")
+        for path in staged:
+            if not path.startswith(spec_dir + "/"):
+                continue
+            filename = path[len(spec_dir) + 1:]
+            for line, severity, message in check_spec_document(filename, contents[path] or "", rules):
+                add(path, line, severity, message)
+
+    return issues
+
+
+def get_hooks_dir(project_path: Path) -> Path:
+    """Resolve the git hooks directory (honours core.hooksPath)"""
+    result = subprocess.run(
+        ["git", "rev-parse", "--git-path", "hooks"],
+        check=True, capture_output=True, text=True, cwd=project_path,
+    )
+    hooks_dir = Path(result.stdout.strip())
+    return hooks_dir if hooks_dir.is_absolute() else project_path / hooks_dir
+
+
 @app.command()
 def init(
     here: bool = typer.Option(False, "--here", help="Initialize in current directory"),
     no_git: bool = typer.Option(False, "--no-git", help="Skip git repository initialization"),
     force: bool = typer.Option(False, "--force", help="Force initialization even if not a Forge project"),
+    agents: Optional[str] = typer.Option(None, "--agents", help="Comma-separated AI agents to install (e.g. github-copilot,cursor,windsurf)"),
+    link_mode: str = typer.Option("copy", "--link-mode", help="How to install forge-sdd/scripts and templates: copy or symlink"),
 ):
     """
     Initialize Forge SDD Toolkit in a Forge project
@@ -562,6 +1602,8 @@ def init(
         forge-sdd init --here
         forge-sdd init --here --no-git
         forge-sdd init --here --force
+        forge-sdd init --here --agents github-copilot,cursor
+        forge-sdd init --here --link-mode symlink
     """
     show_banner()
 
@@ -596,8 +1638,22 @@ def init(
     ]
     console.print(Panel("\n".join(setup_lines), border_style="cyan", padding=(1, 2)))
 
-    # Select AI agent
-    ai_agent = select_ai_agent()
+    if link_mode not in LINK_MODES:
+        console.print(f"[red]Error:[/red] invalid --link-mode [cyan]{link_mode}[/cyan] (choose from {', '.join(LINK_MODES)})")
+        raise typer.Exit(1)
+
+    # Select AI agent(s)
+    if agents:
+        try:
+            ai_agents = parse_agents_option(agents)
+        except ValueError as e:
+            console.print(f"[red]Error:[/red] {e}")
+            raise typer.Exit(1)
+        registry = load_agent_registry()
+        names = ", ".join(registry[agent_id]["name"] for agent_id in ai_agents)
+        console.print(f"[green]✓[/green] Selected: [cyan]{names}[/cyan]\n")
+    else:
+        ai_agents = [select_ai_agent()]
 
     # Check for required tools
     should_init_git = False
@@ -625,7 +1681,7 @@ def init(
         try:
             # Copy toolkit structure
             tracker.start("toolkit")
-            stats = copy_toolkit_structure(project_path, ai_agent, tracker)
+            stats = copy_toolkit_structure(project_path, ai_agents, tracker, link_mode=link_mode)
             tracker.complete("toolkit", f"{stats['files']} files in {stats['dirs']} directories")
 
             # Create forge-specs directory
@@ -635,7 +1691,7 @@ def init(
 
             # Create README guide
             tracker.start("readme")
-            create_readme_guide(project_path)
+            create_readme_guide(project_path, ai_agents)
             tracker.complete("readme", "README-FORGE-SDD.md")
 
             # Make scripts executable
@@ -670,37 +1726,25 @@ def init(
     console.print("\n[bold green]Toolkit installed successfully![/bold green]")
 
     # Check for legacy structures from older versions
-    legacy_prompts = project_path / "prompts"
-    legacy_scripts = project_path / "scripts"
-    legacy_templates = project_path / "templates"
-    legacy_forge_specs = project_path / "forge-specs"
-    
-    has_legacy = any([
-        legacy_prompts.exists() and (project_path / ".github" / "prompts").exists(),
-        legacy_scripts.exists() and (project_path / "forge-sdd" / "scripts").exists(),
-        legacy_templates.exists() and (project_path / "forge-sdd" / "templates").exists(),
-        legacy_forge_specs.exists()
-    ])
-    
-    if has_legacy:
+    legacy = find_legacy_paths(project_path)
+    if legacy:
         console.print()
         console.print(
             "[yellow]⚠️  Legacy Structure Detected[/yellow]\n"
             "[yellow]   Found old toolkit files in project root. New structure uses 'forge-sdd/' directory.[/yellow]\n"
             "[yellow]   You can safely remove these if desired:[/yellow]"
         )
-        if legacy_prompts.exists():
-            console.print("[yellow]   • prompts/ (now in .github/prompts/)[/yellow]")
-        if legacy_scripts.exists():
-            console.print("[yellow]   • scripts/ (now in forge-sdd/scripts/)[/yellow]")
-        if legacy_templates.exists():
-            console.print("[yellow]   • templates/ (now in forge-sdd/templates/)[/yellow]")
-        if legacy_forge_specs.exists():
-            console.print("[yellow]   • forge-specs/ (now in forge-sdd/specs/)[/yellow]")
+        for old_path, new_location in legacy:
+            console.print(f"[yellow]   • {old_path}/ (now in {new_location}/)[/yellow]")
 
     # Next steps
-    steps_lines = [
-        "1. Open GitHub Copilot Chat in VS Code",
+    registry = load_agent_registry()
+    steps_lines = ["1. Open your AI assistant's chat:"]
+    for agent_id in ai_agents:
+        agent = registry[agent_id]
+        location = f" (commands in [cyan]{agent['prompts']['target_dir']}/[/cyan])" if agent.get("prompts") else ""
+        steps_lines.append(f"   • {agent['chat']}{location}")
+    steps_lines += [
         "2. Start using slash commands:",
         "   • [cyan]/forge-ideate[/cyan] - Create specification",
         "   • [cyan]/forge-plan[/cyan] - Create implementation plan",
@@ -729,44 +1773,14 @@ def check():
     tracker.add("forge", "Forge CLI")
 
     # Check each tool
-    git_ok = check_tool("git")
-    if git_ok:
-        tracker.complete("git", "available")
-    else:
-        tracker.error("git", "not found")
-
-    node_ok = check_tool("node")
-    if node_ok:
-        try:
-            result = subprocess.run(["node", "--version"], capture_output=True, text=True)
-            version = result.stdout.strip()
-            tracker.complete("node", version)
-        except:
-            tracker.complete("node", "available")
-    else:
-        tracker.error("node", "not found")
-
-    npm_ok = check_tool("npm")
-    if npm_ok:
-        try:
-            result = subprocess.run(["npm", "--version"], capture_output=True, text=True)
-            version = result.stdout.strip()
-            tracker.complete("npm", version)
-        except:
-            tracker.complete("npm", "available")
-    else:
-        tracker.error("npm", "not found")
-
-    forge_ok = check_tool("forge")
-    if forge_ok:
-        try:
-            result = subprocess.run(["forge", "--version"], capture_output=True, text=True)
-            version = result.stdout.strip()
-            tracker.complete("forge", version)
-        except:
-            tracker.complete("forge", "available")
-    else:
-        tracker.error("forge", "not found")
+    versions = {}
+    for tool in REQUIRED_TOOLS:
+        versions[tool] = detect_tool_version(tool)
+        if versions[tool]:
+            tracker.complete(tool, versions[tool])
+        else:
+            tracker.error(tool, "not found")
+    git_ok, node_ok, npm_ok, forge_ok = (versions[tool] is not None for tool in REQUIRED_TOOLS)
 
     console.print(tracker.render())
     console.print()
@@ -840,6 +1854,408 @@ def help_commands():
         console.print()
 
 
+@app.command()
+def affected(
+    base: str = typer.Option("origin/main", "--base", help="Git ref to compare against (via its merge base with HEAD)"),
+):
+    """
+    Print specs, modules and functions affected by changes since a git ref
+
+    Diffs against the merge base of the ref and HEAD (like a pull request
+    diff, so commits that landed on the ref later are ignored) and maps each
+    changed path to the
+    spec directory or manifest function/resource it belongs to. Output is JSON
+    so CI can scope validation and tests to the affected set.
+
+    Examples:
+        forge-sdd affected --base origin/main
+        forge-sdd affected --base HEAD~1 | jq -r '.specs[]'
+    """
+    project_path = Path.cwd()
+
+    try:
+        changed = get_changed_paths(project_path, base)
+    except FileNotFoundError:
+        console.print("[red]Error:[/red] git not found")
+        raise typer.Exit(1)
+    except subprocess.CalledProcessError as e:
+        console.print(f"[red]Error:[/red] git diff against [cyan]{base}[/cyan] failed: {e.stderr.strip()}")
+        raise typer.Exit(1)
+
+    try:
+        result = compute_affected(project_path, changed)
+    except yaml.YAMLError as e:
+        console.print(f"[red]Error:[/red] could not parse manifest.yml: {e}")
+        raise typer.Exit(1)
+
+    result = {"base": base, **result}
+    typer.echo(json.dumps(result, indent=2))
+
+
+@app.command()
+def results(
+    spec: Optional[str] = typer.Option(None, "--spec", help="Show the run history of one spec"),
+    failing: bool = typer.Option(False, "--failing", help="Only specs whose last run failed"),
+    flaky: bool = typer.Option(False, "--flaky", help="Specs that both passed and failed in recent runs"),
+    window: int = typer.Option(10, "--window", help="Number of recent runs per spec considered by --flaky"),
+    json_output: bool = typer.Option(False, "--json", help="Print results as JSON"),
+):
+    """
+    Aggregate test-results.md files into a ledger and query it
+
+    Every spec's test-results.md is recorded in forge-sdd/results.db as a new
+    run whenever its content changes. Unchanged files are not re-parsed.
+
+    Examples:
+        forge-sdd results
+        forge-sdd results --failing
+        forge-sdd results --spec 001-issue-panel
+        forge-sdd results --flaky --window 20 --json
+    """
+    project_path = Path.cwd()
+
+    if not (project_path / "forge-sdd").is_dir():
+        console.print("[red]Error:[/red] forge-sdd/ not found. Run [cyan]forge-sdd init[/cyan] in the project first")
+        raise typer.Exit(1)
+
+    conn = open_results_ledger(project_path)
+    try:
+        appended = update_results_ledger(conn, project_path)
+        if spec:
+            rows = query_spec_runs(conn, spec)
+        elif flaky:
+            rows = query_flaky_specs(conn, window)
+        else:
+            rows = query_last_runs(conn, failing_only=failing)
+    finally:
+        conn.close()
+
+    if json_output:
+        typer.echo(json.dumps(rows, indent=2))
+        return
+
+    status_styles = {"passed": "green", "failed": "red", "unknown": "yellow"}
+    if spec:
+        table = Table(title=f"Runs of {spec}", border_style="cyan")
+        for column in ("Status", "Passed", "Failed", "Skipped", "Date"):
+            table.add_column(column)
+        for row in rows:
+            style = status_styles.get(row["status"], "white")
+            table.add_row(
+                f"[{style}]{row['status']}[/{style}]", str(row["passed"]),
+                str(row["failed"]), str(row["skipped"]), row["date"],
+            )
+    elif flaky:
+        table = Table(title=f"Flaky specs (last {window} runs)", border_style="cyan")
+        for column in ("Spec", "Passed runs", "Failed runs", "Runs"):
+            table.add_column(column)
+        for row in rows:
+            table.add_row(row["spec"], str(row["passed_runs"]), str(row["failed_runs"]), str(row["runs"]))
+    else:
+        table = Table(title="Failing specs" if failing else "Last run per spec", border_style="cyan")
+        for column in ("Spec", "Status", "Passed", "Failed", "Skipped", "Date", "Runs"):
+            table.add_column(column)
+        for row in rows:
+            style = status_styles.get(row["status"], "white")
+            table.add_row(
+                row["spec"], f"[{style}]{row['status']}[/{style}]", str(row["passed"]),
+                str(row["failed"]), str(row["skipped"]), row["date"], str(row["runs"]),
+            )
+
+    console.print(table)
+    console.print(f"[dim]{appended} new run(s) recorded in {RESULTS_LEDGER}[/dim]")
+
+
+@app.command()
+def serve(
+    stdio: bool = typer.Option(False, "--stdio", help="Speak JSON-RPC over stdin/stdout"),
+    socket_path: Optional[Path] = typer.Option(None, "--socket", help="Listen on this Unix domain socket"),
+):
+    """
+    Run a long-lived JSON-RPC server for editor integrations
+
+    Keeps the parsed manifest.yml, templates and spec listing in memory and
+    rebuilds each one only when its file's mtime changes. Messages are
+    newline-delimited JSON-RPC 2.0 objects.
+
+    Examples:
+        forge-sdd serve --stdio
+        forge-sdd serve --socket /tmp/forge-sdd.sock
+    """
+    if stdio == (socket_path is not None):
+        console.print("[red]Error:[/red] use exactly one of [cyan]--stdio[/cyan] or [cyan]--socket PATH[/cyan]")
+        raise typer.Exit(1)
+
+    from forge_sdd_server import ForgeSDDServer, serve_stdio, serve_unix_socket
+
+    server = ForgeSDDServer(Path.cwd())
+    if stdio:
+        serve_stdio(server)
+        return
+
+    try:
+        serve_unix_socket(server, socket_path)
+    except OSError as e:
+        console.print(f"[red]Error:[/red] could not listen on [cyan]{socket_path}[/cyan]: {e}")
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def completion(
+    shell: str = typer.Argument(..., help="Shell to generate the completion script for (bash, zsh, fish)"),
+):
+    """
+    Print a shell completion script
+
+    The script calls the lightweight forge-sdd-complete helper, which answers
+    each TAB press without loading the full CLI.
+
+    Examples:
+        eval "$(forge-sdd completion bash)"        # ~/.bashrc
+        eval "$(forge-sdd completion zsh)"         # ~/.zshrc
+        forge-sdd completion fish > ~/.config/fish/completions/forge-sdd.fish
+    """
+    from forge_sdd_complete import COMPLETION_SCRIPTS
+
+    if shell not in COMPLETION_SCRIPTS:
+        console.print(f"[red]Error:[/red] unsupported shell [cyan]{shell}[/cyan] (choose from {', '.join(COMPLETION_SCRIPTS)})")
+        raise typer.Exit(1)
+    typer.echo(COMPLETION_SCRIPTS[shell], nl=False)
+
+
+specs_app = typer.Typer(help="List, archive and read feature specifications")
+app.add_typer(specs_app, name="specs")
+
+
+@specs_app.command("list")
+def specs_list():
+    """List specs with their checklist progress"""
+    project_path = Path.cwd()
+
+    table = Table(title="Specs", border_style="cyan")
+    for column in ("Spec", "Status", "Checklist"):
+        table.add_column(column)
+    for spec_dir in list_spec_dirs(project_path):
+        if is_archived_spec(spec_dir):
+            table.add_row(spec_dir.name, "[dim]archived[/dim]", "")
+            continue
+        checked, unchecked = spec_checklist_status(spec_dir)
+        done = checked > 0 and unchecked == 0
+        status = "[green]done[/green]" if done else "[yellow]in progress[/yellow]"
+        table.add_row(spec_dir.name, status, f"{checked}/{checked + unchecked}")
+    console.print(table)
+
+
+@specs_app.command("archive")
+def specs_archive(
+    specs: Optional[List[str]] = typer.Argument(None, help="Spec directory names to archive"),
+    done: bool = typer.Option(False, "--done", help="Archive every spec whose checklists are complete"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only show which specs would be archived"),
+):
+    """
+    Pack specs into forge-sdd/specs-archive.zip, leaving a small stub behind
+
+    Examples:
+        forge-sdd specs archive --done
+        forge-sdd specs archive --done --dry-run
+        forge-sdd specs archive 001-issue-panel
+    """
+    project_path = Path.cwd()
+    specs_dir = project_path / "forge-sdd" / "specs"
+
+    if not specs and not done:
+        console.print("[red]Error:[/red] name the specs to archive or use [cyan]--done[/cyan]")
+        raise typer.Exit(1)
+
+    if specs:
+        selected = []
+        for name in specs:
+            spec_dir = specs_dir / name
+            if not is_plain_name(name) or not spec_dir.is_dir():
+                console.print(f"[red]Error:[/red] spec not found: [cyan]{name}[/cyan]")
+                raise typer.Exit(1)
+            if is_archived_spec(spec_dir):
+                console.print(f"[yellow]Skipping {name}: already archived[/yellow]")
+                continue
+            selected.append(spec_dir)
+    else:
+        selected = [spec_dir for spec_dir in list_spec_dirs(project_path) if is_spec_done(spec_dir)]
+
+    if not selected:
+        console.print("[yellow]No specs to archive[/yellow]")
+        return
+
+    if dry_run:
+        for spec_dir in selected:
+            console.print(f"  • {spec_dir.name}")
+        console.print(f"[dim]{len(selected)} spec(s) would be archived[/dim]")
+        return
+
+    try:
+        archived = archive_specs(project_path, selected)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        console.print(f"[red]Error:[/red] archive failed: {e}")
+        raise typer.Exit(1)
+
+    for entry in archived:
+        console.print(f"[green]✓[/green] {entry['spec']} [dim]({len(entry['files'])} files, {entry['bytes']} bytes)[/dim]")
+    archive_size = (project_path / SPECS_ARCHIVE).stat().st_size
+    console.print(f"\n[bold green]{len(archived)} spec(s) archived[/bold green] in [cyan]{SPECS_ARCHIVE}[/cyan] [dim]({archive_size} bytes)[/dim]")
+
+
+@specs_app.command("show")
+def specs_show(
+    spec: str = typer.Argument(..., help="Spec directory name"),
+    filename: str = typer.Argument("feature-spec.md", help="Document to show"),
+):
+    """
+    Print a spec document, reading archived specs straight from the archive
+
+    Examples:
+        forge-sdd specs show 001-issue-panel
+        forge-sdd specs show 001-issue-panel test-results.md
+    """
+    try:
+        text = read_spec_file(Path.cwd(), spec, filename)
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e} (use a spec directory and file name, without /, \\ or ..)")
+        raise typer.Exit(1)
+    except FileNotFoundError:
+        console.print(f"[red]Error:[/red] not found: [cyan]{spec}/{filename}[/cyan]")
+        raise typer.Exit(1)
+    typer.echo(text, nl=not text.endswith("\n"))
+
+
+@specs_app.command("search")
+def specs_search(
+    pattern: str = typer.Argument(..., help="Regular expression to search for"),
+    ignore_case: bool = typer.Option(False, "--ignore-case", "-i", help="Case-insensitive search"),
+    json_output: bool = typer.Option(False, "--json", help="Print matches as JSON"),
+):
+    """
+    Search active and archived specs without extracting the archive
+
+    Examples:
+        forge-sdd specs search "jira:issuePanel"
+        forge-sdd specs search -i "storage" --json
+    """
+    try:
+        matches = search_specs(Path.cwd(), pattern, ignore_case=ignore_case)
+    except re.error as e:
+        console.print(f"[red]Error:[/red] invalid pattern: {e}")
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(matches, indent=2, ensure_ascii=False))
+        return
+
+    for match in matches:
+        archived = " [dim](archived)[/dim]" if match["archived"] else ""
+        console.print(
+            f"[cyan]{match['spec']}/{match['file']}[/cyan]:[yellow]{match['line']}[/yellow]{archived}: {escape(match['text'])}"
+        )
+    if not matches:
+        console.print("[yellow]No matches[/yellow]")
+
+
+hooks_app = typer.Typer(help="Install git hooks that validate specs and manifest.yml")
+app.add_typer(hooks_app, name="hooks")
+
+
+@hooks_app.command("install")
+def hooks_install(
+    force: bool = typer.Option(False, "--force", help="Replace an existing pre-commit hook (kept as pre-commit.bak)"),
+):
+    """
+    Install a pre-commit hook that checks only staged specs and manifest.yml
+
+    The hook exits immediately when no manifest.yml or forge-sdd/specs/ file
+    is staged. Otherwise it runs 'forge-sdd hooks run'.
+
+    Examples:
+        forge-sdd hooks install
+        forge-sdd hooks install --force
+    """
+    project_path = Path.cwd()
+    if not is_git_repo(project_path):
+        console.print("[red]Error:[/red] not a git repository")
+        raise typer.Exit(1)
+
+    prefix = subprocess.run(
+        ["git", "rev-parse", "--show-prefix"],
+        check=True, capture_output=True, text=True, cwd=project_path,
+    ).stdout.rstrip("\n")
+    hooks_dir = get_hooks_dir(project_path)
+    hook_path = hooks_dir / "pre-commit"
+
+    if hook_path.exists() and HOOK_MARKER not in hook_path.read_text(encoding="utf-8", errors="ignore"):
+        if not force:
+            console.print(
+                f"[red]Error:[/red] [cyan]{hook_path}[/cyan] already exists.\n"
+                "Use [yellow]--force[/yellow] to replace it (a backup is kept as pre-commit.bak)."
+            )
+            raise typer.Exit(1)
+        shutil.copy2(hook_path, hook_path.with_name("pre-commit.bak"))
+
+    hooks_dir.mkdir(parents=True, exist_ok=True)
+    hook_path.write_text(PRE_COMMIT_HOOK.format(marker=HOOK_MARKER, prefix=shlex.quote(prefix)), encoding="utf-8")
+    os.chmod(hook_path, 0o755)
+    console.print(f"[green]✓[/green] pre-commit hook installed at [cyan]{hook_path}[/cyan]")
+
+
+@hooks_app.command("uninstall")
+def hooks_uninstall():
+    """Remove the pre-commit hook installed by 'forge-sdd hooks install'"""
+    project_path = Path.cwd()
+    if not is_git_repo(project_path):
+        console.print("[red]Error:[/red] not a git repository")
+        raise typer.Exit(1)
+
+    hook_path = get_hooks_dir(project_path) / "pre-commit"
+    if not hook_path.exists() or HOOK_MARKER not in hook_path.read_text(encoding="utf-8", errors="ignore"):
+        console.print("[yellow]No forge-sdd pre-commit hook installed[/yellow]")
+        return
+
+    hook_path.unlink()
+    backup = hook_path.with_name("pre-commit.bak")
+    if backup.exists():
+        backup.rename(hook_path)
+        console.print("[green]✓[/green] pre-commit hook removed, previous hook restored")
+    else:
+        console.print("[green]✓[/green] pre-commit hook removed")
+
+
+@hooks_app.command("run")
+def hooks_run():
+    """
+    Validate staged manifest.yml and spec files (called by the pre-commit hook)
+
+    Checks manifest structure rules, unfilled template placeholders and
+    required spec sections. Errors block the commit; warnings do not.
+    """
+    project_path = Path.cwd()
+    try:
+        issues = validate_staged(project_path)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        console.print(f"[red]Error:[/red] could not read staged files: {e}")
+        raise typer.Exit(1)
+
+    errors = [issue for issue in issues if issue["severity"] == "error"]
+    for issue in issues:
+        location = issue["path"] + (f":{issue['line']}" if issue["line"] else "")
+        style = "red" if issue["severity"] == "error" else "yellow"
+        console.print(f"[{style}]{issue['severity']}[/{style}] [cyan]{location}[/cyan]: {escape(issue['message'])}")
+
+    if errors:
+        console.print(
+            f"\n[bold red]Commit blocked: {len(errors)} error(s) in staged Forge SDD files.[/bold red]\n"
+            "[dim]Fix them or bypass with 'git commit --no-verify'.[/dim]"
+        )
+        raise typer.Exit(1)
+
+
 def main():
     app()
 
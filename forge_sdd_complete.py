@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Forge SDD shell completion helper
+
+Answers TAB completion requests for the forge-sdd CLI using only the standard
+library, so each completion avoids importing Typer and Rich. Commands and
+options come from the precomputed COMPLETION_TABLE below; spec directory
+names and agent ids are cached on disk and refreshed when forge-sdd/specs/
+or one of the toolkit's ai-agents/*/agent.yml descriptors changes.
+
+Usage (called by the scripts printed by `forge-sdd completion <shell>`):
+    forge-sdd-complete <cword> <words...>
+    forge-sdd-complete --script bash|zsh|fish
+"""
+
+from __future__ import annotations
+
+# Only cheap stdlib imports here: this module runs on every TAB press
+import os
+import sys
+import zlib
+
+# Keep in sync with the commands in forge_sdd_cli.py.
+# command -> {option: value kind, or None for flags}
+COMPLETION_TABLE: dict[str, dict[str, str | None]] = {
+    "init": {"--here": None, "--no-git": None, "--force": None, "--agents": "agents", "--link-mode": "link_modes"},
+    "check": {},
+    "version": {},
+    "help-commands": {},
+    "affected": {"--base": "ref"},
+    "results": {"--spec": "specs", "--failing": None, "--flaky": None, "--window": "int", "--json": None},
+    "serve": {"--stdio": None, "--socket": "file"},
+    "completion": {},
+    "specs": {},
+    "specs list": {},
+    "specs archive": {"--done": None, "--dry-run": None},
+    "specs show": {},
+    "specs search": {"--ignore-case": None, "-i": None, "--json": None},
+    "hooks": {},
+    "hooks install": {"--force": None},
+    "hooks uninstall": {},
+    "hooks run": {},
+}
+
+# command -> value kind of its positional arguments
+POSITIONAL_ARGS: dict[str, str] = {
+    "completion": "shells",
+    "specs archive": "specs",
+    "specs show": "specs",
+}
+
+# Commands whose positional arguments can repeat
+REPEATED_POSITIONALS = {"specs archive"}
+
+STATIC_VALUES: dict[str, list[str]] = {
+    "shells": ["bash", "zsh", "fish"],
+    "link_modes": ["copy", "symlink"],
+}
+
+SUBCOMMANDS: dict[str, list[str]] = {
+    "specs": ["list", "archive", "show", "search"],
+    "hooks": ["install", "uninstall", "run"],
+}
+
+COMPLETION_SCRIPTS = {
+    "bash": """\
+# forge-sdd bash completion
+_forge_sdd_complete() {
+    local IFS=$'\\n'
+    COMPREPLY=($(forge-sdd-complete "$COMP_CWORD" "${COMP_WORDS[@]}" 2>/dev/null))
+}
+complete -o default -F _forge_sdd_complete forge-sdd
+""",
+    "zsh": """\
+#compdef forge-sdd
+# forge-sdd zsh completion
+_forge_sdd() {
+    local -a candidates
+    candidates=("${(@f)$(forge-sdd-complete $((CURRENT - 1)) "${words[@]}" 2>/dev/null)}")
+    candidates=(${candidates:#})
+    if (( ${#candidates} )); then
+        compadd -Q -- "${candidates[@]}"
+    else
+        _files
+    fi
+}
+compdef _forge_sdd forge-sdd
+""",
+    "fish": """\
+# forge-sdd fish completion
+function __forge_sdd_complete
+    set -l tokens (commandline -opc)
+    forge-sdd-complete (count $tokens) $tokens (commandline -ct) 2>/dev/null
+end
+complete -c forge-sdd -f -a '(__forge_sdd_complete)'
+""",
+}
+
+
+def _cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "forge-sdd")
+
+
+def _cached_lines(cache_name: str, stamp: str, build) -> list[str]:
+    """Return build()'s lines, cached on disk until stamp changes
+
+    The cache file holds the stamp on its first line and one value per line.
+    """
+    cache_file = os.path.join(_cache_dir(), cache_name)
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if lines and lines[0] == stamp:
+            return lines[1:]
+    except OSError:
+        pass
+
+    values = build()
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            f.write("\n".join([stamp] + values) + "\n")
+    except OSError:
+        pass
+    return values
+
+
+def list_spec_names(project_path: str) -> list[str]:
+    """List spec directory names, cached per project until forge-sdd/specs/ changes
+
+    Validated with a single stat of the specs directory, whose mtime changes
+    when specs are added or removed.
+    """
+    specs_dir = os.path.realpath(os.path.join(project_path, "forge-sdd", "specs"))
+    try:
+        stamp = str(os.stat(specs_dir).st_mtime_ns)
+    except OSError:
+        return []
+
+    def build() -> list[str]:
+        with os.scandir(specs_dir) as entries:
+            return sorted(e.name for e in entries if e.is_dir() and not e.name.startswith("."))
+
+    key = f"{zlib.crc32(specs_dir.encode('utf-8')):08x}"
+    return _cached_lines(f"specs-{key}.txt", stamp, build)
+
+
+def _find_agents_dir() -> str | None:
+    """Locate the toolkit's ai-agents/ directory like forge_sdd_cli.find_toolkit_root"""
+    current = os.path.dirname(os.path.abspath(__file__))
+    for _ in range(6):
+        for candidate in (
+            os.path.join(current, "ai-agents"),
+            os.path.join(current, "forge_sdd_toolkit_data", "ai-agents"),
+        ):
+            if os.path.isdir(candidate):
+                return candidate
+        current = os.path.dirname(current)
+    return None
+
+
+def _read_agent_descriptor(path: str, default_id: str) -> tuple[str, str]:
+    """Read the top-level id and status keys of an agent.yml without a YAML parser"""
+    agent_id, status = default_id, "supported"
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            key, sep, value = line.partition(":")
+            value = value.split("#", 1)[0].strip().strip("'\"")
+            if sep and value and key == "id":
+                agent_id = value
+            elif sep and value and key == "status":
+                status = value
+    return agent_id, status
+
+
+def list_agent_names() -> list[str]:
+    """List installable agent ids, cached until any ai-agents/*/agent.yml changes
+
+    Ids come from each descriptor's id key (the directory name by default, as
+    in forge_sdd_cli.load_agent_registry); agents not marked 'supported' are
+    left out. The cache is validated with a stat of every agent.yml, so adding,
+    editing or removing a descriptor refreshes it.
+    """
+    agents_dir = _find_agents_dir()
+    if agents_dir is None:
+        return []
+
+    descriptors = []
+    with os.scandir(agents_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            descriptor = os.path.join(entry.path, "agent.yml")
+            try:
+                descriptors.append((entry.name, descriptor, os.stat(descriptor).st_mtime_ns))
+            except OSError:
+                continue
+    descriptors.sort()
+    stamp = " ".join(f"{name}:{mtime_ns}" for name, _, mtime_ns in descriptors)
+
+    def build() -> list[str]:
+        agents = []
+        for name, descriptor, _ in descriptors:
+            try:
+                agent_id, status = _read_agent_descriptor(descriptor, name)
+            except OSError:
+                continue
+            if status == "supported":
+                agents.append(agent_id)
+        return sorted(agents)
+
+    key = f"{zlib.crc32(agents_dir.encode('utf-8')):08x}"
+    return _cached_lines(f"agents-{key}.txt", stamp, build)
+
+
+def _values(kind: str, current: str) -> list[str]:
+    if kind == "specs":
+        return [s for s in list_spec_names(os.getcwd()) if s.startswith(current)]
+    if kind == "agents":
+        # Comma-separated list: complete the last segment, keep the rest
+        head, _, last = current.rpartition(",")
+        prefix = head + "," if head else ""
+        chosen = set(head.split(",")) if head else set()
+        return [prefix + a for a in list_agent_names() if a.startswith(last) and a not in chosen]
+    return [v for v in STATIC_VALUES.get(kind, []) if v.startswith(current)]
+
+
+def complete(words: list[str], cword: int) -> list[str]:
+    """Return completion candidates for words[cword] given the command line words"""
+    current = words[cword] if cword < len(words) else ""
+    args = words[1:cword]
+    command = next((w for w in args if not w.startswith("-")), None)
+
+    if command is None:
+        return [c for c in COMPLETION_TABLE if " " not in c and c.startswith(current)] + (
+            ["--help"] if "--help".startswith(current) else []
+        )
+
+    command_index = args.index(command)
+    # Descend into a subcommand group (e.g. "specs archive")
+    if command in SUBCOMMANDS:
+        subcommand = next((w for w in args[command_index + 1:] if not w.startswith("-")), None)
+        if subcommand is None:
+            return [c for c in SUBCOMMANDS[command] + ["--help"] if c.startswith(current)]
+        command_index = args.index(subcommand, command_index + 1)
+        command = f"{command} {subcommand}"
+
+    options = COMPLETION_TABLE.get(command)
+    if options is None:
+        return []
+
+    previous = words[cword - 1] if cword >= 1 else ""
+    if previous in options and options[previous] is not None:
+        return _values(options[previous], current)
+
+    positionals = [
+        w for i, w in enumerate(args[command_index + 1:], start=command_index + 1)
+        if not w.startswith("-") and not (args[i - 1] in options and options[args[i - 1]] is not None)
+    ]
+    if (
+        command in POSITIONAL_ARGS
+        and (not positionals or command in REPEATED_POSITIONALS)
+        and not current.startswith("-")
+    ):
+        return [v for v in _values(POSITIONAL_ARGS[command], current) if v not in positionals]
+
+    used = set(args)
+    return [o for o in list(options) + ["--help"] if o.startswith(current) and o not in used]
+
+
+def main():
+    argv = sys.argv[1:]
+    if len(argv) == 2 and argv[0] == "--script":
+        if argv[1] not in COMPLETION_SCRIPTS:
+            sys.stderr.write(f"Unsupported shell: {argv[1]} (choose from {', '.join(COMPLETION_SCRIPTS)})\n")
+            sys.exit(1)
+        sys.stdout.write(COMPLETION_SCRIPTS[argv[1]])
+        return
+    if not argv or not argv[0].isdigit():
+        sys.stderr.write(__doc__)
+        sys.exit(1)
+    candidates = complete(argv[1:], int(argv[0]))
+    if candidates:
+        sys.stdout.write("\n".join(candidates) + "\n")
+
+
+if __name__ == "__main__":
+    main()
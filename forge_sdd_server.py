@@ -0,0 +1,355 @@
+"""
+Forge SDD Server - Long-running JSON-RPC 2.0 server for editor integrations
+
+Keeps the parsed manifest.yml, toolkit templates and spec listings in memory
+between requests. Each cached entry remembers the mtime and size of the file
+or directory it was built from and is rebuilt as soon as that changes.
+
+Messages are newline-delimited JSON-RPC 2.0 objects, one per line, over
+stdin/stdout or a Unix domain socket.
+
+Usage:
+    forge-sdd serve --stdio
+    forge-sdd serve --socket /tmp/forge-sdd.sock
+
+Example request:
+    {"jsonrpc": "2.0", "id": 1, "method": "manifest/index"}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TextIO
+
+import yaml
+
+import forge_sdd_api
+from forge_sdd_cli import VERSION, compute_affected, find_toolkit_root, get_changed_paths, index_manifest
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_ERROR = -32000
+
+
+class RPCError(Exception):
+    """Error returned to the client as a JSON-RPC error object"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class MtimeCache:
+    """Cache values built from files, invalidated by the file's mtime and size"""
+
+    def __init__(self):
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, path: Path, loader: Callable[[Path], Any]) -> Any:
+        """Return the cached value for path, calling loader(path) if it changed
+
+        A missing path is cached as loader's result for the missing file, so
+        loader must handle it.
+        """
+        try:
+            st = path.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = None
+
+        key = (namespace, str(path))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+
+        value = loader(path)
+        with self._lock:
+            self._entries[key] = (stamp, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _param(params: dict, name: str, expected: type, default: Any = None) -> Any:
+    """Fetch an optional param, raising INVALID_PARAMS if it has the wrong type"""
+    value = params.get(name, default)
+    # bool is a subclass of int; only accept it where a bool is expected
+    if value is not None and (not isinstance(value, expected) or (expected is not bool and isinstance(value, bool))):
+        raise RPCError(INVALID_PARAMS, f"'{name}' must be of type {expected.__name__}")
+    return value
+
+
+def _load_manifest(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    except yaml.YAMLError as e:
+        raise RPCError(SERVER_ERROR, f"Could not parse {path}: {e}")
+    return data if isinstance(data, dict) else {}
+
+
+def _list_dir_names(path: Path) -> list:
+    if not path.exists():
+        return []
+    return sorted(p.name for p in path.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+
+def _list_file_names(path: Path) -> list:
+    if not path.exists():
+        return []
+    return sorted(p.name for p in path.iterdir() if p.is_file())
+
+
+class ForgeSDDServer:
+    """Dispatches JSON-RPC requests for one project directory"""
+
+    def __init__(self, project_path: Path):
+        self.project_path = project_path.resolve()
+        self.toolkit_root = find_toolkit_root()
+        self.cache = MtimeCache()
+        self.running = True
+        self.methods: Dict[str, Callable[[dict], Any]] = {
+            "ping": lambda params: "pong",
+            "version": lambda params: VERSION,
+            "shutdown": self.shutdown,
+            "cache/clear": self.clear_cache,
+            "manifest/get": self.manifest_get,
+            "manifest/index": self.manifest_index,
+            "specs/list": self.specs_list,
+            "templates/list": self.templates_list,
+            "templates/get": self.templates_get,
+            "affected": self.affected,
+            "tools/check": lambda params: forge_sdd_api.check_tools(),
+            "project/init": self.project_init,
+            "feature/create": self.feature_create,
+        }
+
+    def _project(self, params: dict) -> Path:
+        path = _param(params, "path", str)
+        return Path(path).resolve() if path else self.project_path
+
+    def _templates_dir(self, params: dict) -> Path:
+        project_templates = self._project(params) / "forge-sdd" / "templates"
+        if project_templates.exists() or self.toolkit_root is None:
+            return project_templates
+        return self.toolkit_root / "templates"
+
+    def shutdown(self, params: dict) -> None:
+        self.running = False
+
+    def clear_cache(self, params: dict) -> None:
+        self.cache.clear()
+
+    def manifest_get(self, params: dict) -> dict:
+        return self.cache.get("manifest", self._project(params) / "manifest.yml", _load_manifest)
+
+    def manifest_index(self, params: dict) -> dict:
+        manifest_path = self._project(params) / "manifest.yml"
+        return self.cache.get(
+            "manifest-index", manifest_path,
+            lambda path: index_manifest(self.cache.get("manifest", path, _load_manifest)),
+        )
+
+    def specs_list(self, params: dict) -> list:
+        specs_dir = self._project(params) / "forge-sdd" / "specs"
+        return [
+            {
+                "name": name,
+                "path": str(specs_dir / name),
+                "files": self.cache.get("spec-files", specs_dir / name, _list_file_names),
+            }
+            for name in self.cache.get("spec-names", specs_dir, _list_dir_names)
+        ]
+
+    def templates_list(self, params: dict) -> list:
+        templates_dir = self._templates_dir(params)
+        return [name for name in self.cache.get("template-names", templates_dir, _list_file_names)
+                if name.endswith(".md")]
+
+    def templates_get(self, params: dict) -> str:
+        name = params.get("name")
+        if not isinstance(name, str) or "/" in name or "\\" in name or name.startswith("."):
+            raise RPCError(INVALID_PARAMS, "'name' must be a template file name")
+        template = self._templates_dir(params) / name
+        if not template.is_file():
+            raise RPCError(INVALID_PARAMS, f"Template not found: {name}")
+        return self.cache.get("template", template, lambda path: path.read_text(encoding="utf-8"))
+
+    def affected(self, params: dict) -> dict:
+        project_path = self._project(params)
+        base = _param(params, "base", str, "origin/main")
+        try:
+            changed = get_changed_paths(project_path, base)
+        except subprocess.CalledProcessError as e:
+            raise RPCError(SERVER_ERROR, f"git diff against {base} failed: {e.stderr.strip()}")
+        return {"base": base, **compute_affected(project_path, changed, self.manifest_index(params))}
+
+    def project_init(self, params: dict) -> dict:
+        agents = params.get("agents", "github-copilot")
+        if not isinstance(agents, str) and not (
+            isinstance(agents, list) and agents and all(isinstance(a, str) for a in agents)
+        ):
+            raise RPCError(INVALID_PARAMS, "'agents' must be a string or a list of strings")
+        return forge_sdd_api.init_project(
+            self._project(params),
+            agents=agents,
+            link_mode=_param(params, "link_mode", str, "copy"),
+            git=_param(params, "git", bool, True),
+            force=_param(params, "force", bool, False),
+        )
+
+    def feature_create(self, params: dict) -> dict:
+        description = _param(params, "description", str)
+        if description is None:
+            raise RPCError(INVALID_PARAMS, "'description' is required")
+        return forge_sdd_api.create_feature(
+            self._project(params), description, create_branch=_param(params, "create_branch", bool, True)
+        )
+
+    def handle(self, message: Any) -> Optional[dict]:
+        """Handle one decoded JSON-RPC message, returning the response (None for notifications)"""
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+            return _error_response(None, INVALID_REQUEST, "Invalid Request")
+
+        request_id = message.get("id")
+        is_notification = "id" not in message
+        params = message.get("params") or {}
+        try:
+            if not isinstance(params, dict):
+                raise RPCError(INVALID_PARAMS, "params must be an object")
+            method = self.methods.get(message["method"])
+            if method is None:
+                raise RPCError(METHOD_NOT_FOUND, f"Method not found: {message['method']}")
+            result = method(params)
+        except RPCError as e:
+            return None if is_notification else _error_response(request_id, e.code, e.message)
+        except (forge_sdd_api.ForgeSDDError, ValueError, OSError) as e:
+            return None if is_notification else _error_response(request_id, SERVER_ERROR, str(e))
+        except Exception as e:
+            # Never let one request take down the long-running server
+            message = f"Internal error: {type(e).__name__}: {e}"
+            return None if is_notification else _error_response(request_id, INTERNAL_ERROR, message)
+
+        if is_notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """Handle one line of input, returning the encoded response line (or None)"""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            message = json.loads(line)
+        except ValueError:
+            response = _error_response(None, PARSE_ERROR, "Parse error")
+        else:
+            if isinstance(message, list):
+                responses = [r for r in (self.handle(m) for m in message) if r is not None]
+                if not message:
+                    responses = _error_response(None, INVALID_REQUEST, "Invalid Request")
+                response = responses or None
+            else:
+                response = self.handle(message)
+        if response is None:
+            return None
+        return json.dumps(response, ensure_ascii=False, default=str)
+
+    def serve_stream(self, reader: TextIO, writer: TextIO):
+        """Answer requests read line by line until EOF or 'shutdown'"""
+        for line in reader:
+            response = self.handle_line(line)
+            if response is not None:
+                writer.write(response + "\n")
+                writer.flush()
+            if not self.running:
+                break
+
+
+def _error_response(request_id: Any, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def serve_stdio(server: ForgeSDDServer):
+    """Serve JSON-RPC over stdin/stdout"""
+    server.serve_stream(sys.stdin, sys.stdout)
+
+
+def _remove_stale_socket(socket_path: Path):
+    """Remove a leftover socket file; refuse to touch a live socket or any other file
+
+    A socket is only considered stale when connecting to it is refused, i.e.
+    no server is listening on it anymore.
+
+    Raises:
+        FileExistsError: If the path exists and is not a socket, or another
+            server is still listening on it
+    """
+    try:
+        mode = socket_path.lstat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket; refusing to replace it")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except ConnectionRefusedError:
+        socket_path.unlink()
+        return
+    finally:
+        probe.close()
+    raise FileExistsError(f"another server is already listening on {socket_path}")
+
+
+def serve_unix_socket(server: ForgeSDDServer, socket_path: Path):
+    """Serve JSON-RPC on a Unix domain socket, one thread per connection
+
+    All connections share the same caches.
+    """
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        raise OSError("Unix domain sockets are not supported on this platform")
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            reader = (line.decode("utf-8", errors="replace") for line in self.rfile)
+            for line in reader:
+                response = server.handle_line(line)
+                if response is not None:
+                    self.wfile.write((response + "\n").encode("utf-8"))
+                if not server.running:
+                    threading.Thread(target=socket_server.shutdown, daemon=True).start()
+                    break
+
+    _remove_stale_socket(socket_path)
+    socket_server = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+    socket_server.daemon_threads = True
+    socket_inode = socket_path.lstat().st_ino
+    try:
+        os.chmod(socket_path, 0o600)
+        socket_server.serve_forever()
+    finally:
+        socket_server.server_close()
+        # Only remove our own socket, never one that replaced it meanwhile
+        try:
+            if socket_path.lstat().st_ino == socket_inode:
+                socket_path.unlink()
+        except FileNotFoundError:
+            pass